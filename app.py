@@ -1,20 +1,20 @@
 """
 Modular FastAPI Application Entry Point
 """
-import sys
-import os
+import asyncio
 from contextlib import asynccontextmanager
 
-# Add the project root directory to Python path
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+import anyio.to_thread
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from src.core.config import settings
 from src.api.routes import question_generation, health
 from src.core.logging import setup_logging
 from src.db.connection import DatabaseManager
+from src.services.content_service import get_content_service, refresh_credentials_periodically
 
 
 @asynccontextmanager
@@ -22,13 +22,33 @@ async def lifespan(app: FastAPI):
     """Application lifespan events"""
     # Startup
     setup_logging()
+
+    # Widen anyio's default worker threadpool (~40 tokens) so sync routes
+    # and sync AWS calls aren't capped by it under load
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    limiter.total_tokens = settings.THREADPOOL_SIZE
+
+    # Build the shared content service eagerly so credential resolution and
+    # the OpenSearch connection pool are paid once at startup, not on the
+    # first request
+    content_service = get_content_service()
+    content_service.opensearch_client.client
+    app.state.content_service = content_service
+
+    # Table probes and chapter-key prewarming run concurrently
     db_manager = DatabaseManager()
-    await db_manager.initialize()
+    await db_manager.initialize(content_service=content_service)
     app.state.db_manager = db_manager
-    
+
+    # Rotate the frozen AWS credential snapshot before STS expiry
+    credential_task = asyncio.create_task(refresh_credentials_periodically())
+
     yield
-    
+
     # Shutdown
+    credential_task.cancel()
+    if hasattr(app.state, 'content_service'):
+        await app.state.content_service.opensearch_client.close()
     if hasattr(app.state, 'db_manager'):
         await app.state.db_manager.close()
 
@@ -39,7 +59,8 @@ def create_app() -> FastAPI:
         title=settings.PROJECT_NAME,
         description=settings.PROJECT_DESCRIPTION,
         version=settings.VERSION,
-        lifespan=lifespan
+        lifespan=lifespan,
+        default_response_class=ORJSONResponse
     )
 
     # Add CORS middleware
@@ -71,6 +92,9 @@ if __name__ == "__main__":
         "app:app",
         host=settings.HOST,
         port=settings.PORT,
+        workers=1 if settings.DEBUG else settings.WORKERS,
+        loop="uvloop",
+        http="httptools",
         reload=settings.DEBUG,
         log_level="info" if not settings.DEBUG else "debug"
     )
@@ -2,23 +2,29 @@
 Core configuration settings for the application
 """
 import os
+from functools import lru_cache
 from typing import List, Optional
-from pydantic import BaseModel
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
     """Application settings"""
-    
+
+    model_config = SettingsConfigDict(env_file=".env", case_sensitive=True, frozen=True)
+
     # Basic app settings
     PROJECT_NAME: str = "Question Generation API - Modular"
     PROJECT_DESCRIPTION: str = "Modular API for generating educational questions using OpenSearch and GraphRAG"
     VERSION: str = "3.0.0"
     DEBUG: bool = False
-    
+    # Re-validate parser output instead of trusting it (debug aid)
+    VALIDATE_PARSED: bool = False
+
     # Server settings
     HOST: str = "0.0.0.0"
     PORT: int = 8000
+    WORKERS: int = int(os.getenv("WEB_CONCURRENCY", str((os.cpu_count() or 1) * 2 + 1)))
+    THREADPOOL_SIZE: int = 200
     
     # CORS settings
     ALLOWED_ORIGINS: List[str] = ["*"]
@@ -32,6 +38,7 @@ class Settings(BaseSettings):
     # OpenSearch settings
     OPENSEARCH_HOST: str = "https://64asp87vin20xc5bhvbf.us-east-1.aoss.amazonaws.com"
     OPENSEARCH_REGION: str = "us-east-1"
+    OPENSEARCH_POOL_MAXSIZE: int = 50
     
     # LLM settings
     LLM_MODEL: str = "arn:aws:bedrock:us-east-1:051826717360:inference-profile/us.anthropic.claude-sonnet-4-20250514-v1:0"
@@ -47,16 +54,24 @@ class Settings(BaseSettings):
     # Question generation settings
     MAX_CHUNKS: int = 200
     MAX_CHARS: int = 100000
-    
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
 
 
-# Initialize settings
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Build the settings instance on first use"""
+    settings = Settings()
+
+    # Set environment variables for backward compatibility
+    os.environ.setdefault("AWS_PROFILE", settings.AWS_PROFILE_NAME)
+    os.environ.setdefault("AWS_REGION", settings.AWS_REGION)
+    os.environ.setdefault("AWS_DEFAULT_REGION", settings.AWS_REGION)
+
+    return settings
+
 
-# Set environment variables for backward compatibility
-os.environ.setdefault("AWS_PROFILE", settings.AWS_PROFILE_NAME)
-os.environ.setdefault("AWS_REGION", settings.AWS_REGION)
-os.environ.setdefault("AWS_DEFAULT_REGION", settings.AWS_REGION)
+def __getattr__(name: str):
+    # Lazy module attribute (PEP 562): `settings` is constructed on first
+    # access, so importing this module doesn't eagerly read env/.env
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,31 +1,65 @@
 """
 Logging configuration for the application
 """
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
 from typing import Any
 
+import orjson
+
 from src.core.config import settings
 
+# Skip the per-record thread/process introspection syscalls
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+
+_queue_listener = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as single-line JSON via orjson"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        log_entry = {
+            "ts": self.formatTime(record),
+            "lvl": record.levelname,
+            "name": record.name,
+            "msg": record.getMessage()
+        }
+        if record.exc_info:
+            log_entry["exc"] = self.formatException(record.exc_info)
+        return orjson.dumps(log_entry).decode()
+
 
 def setup_logging() -> None:
     """Setup application logging"""
-    
+    global _queue_listener
+    if _queue_listener is not None:
+        return
+
     # Configure logging level based on debug setting
     log_level = logging.DEBUG if settings.DEBUG else logging.INFO
-    
-    # Configure logging format
-    log_format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    
-    # Setup logging
-    logging.basicConfig(
-        level=log_level,
-        format=log_format,
-        handlers=[
-            logging.StreamHandler(sys.stdout)
-        ]
-    )
-    
+
+    # Request threads only enqueue records; a listener thread does the
+    # formatting and the stdout write, so handlers never contend on the
+    # stream lock in the hot path
+    log_queue = queue.Queue(-1)
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(JsonFormatter())
+
+    root_logger = logging.getLogger()
+    root_logger.setLevel(log_level)
+    root_logger.handlers = [logging.handlers.QueueHandler(log_queue)]
+
+    _queue_listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    _queue_listener.start()
+    atexit.register(_queue_listener.stop)
+
     # Set third-party library log levels
     logging.getLogger("boto3").setLevel(logging.WARNING)
     logging.getLogger("botocore").setLevel(logging.WARNING)
@@ -40,7 +74,7 @@ def get_logger(name: str) -> logging.Logger:
 
 class LoggerMixin:
     """Mixin to add logging capability to classes"""
-    
+
     @property
     def logger(self) -> logging.Logger:
         return get_logger(self.__class__.__name__)
@@ -1,113 +1,156 @@
 """
 Database connection and management
 """
-import boto3
+import asyncio
+
+import aioboto3
 from typing import Optional, Dict, Any
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
 from src.core.config import settings
 from src.core.logging import LoggerMixin
 
+# Shared transport tuning for all DynamoDB clients: keep TCP connections
+# alive between calls and pool enough of them for concurrent requests,
+# so short operations don't pay a fresh TCP+TLS handshake each time
+_DYNAMODB_CONFIG = Config(
+    tcp_keepalive=True,
+    max_pool_connections=50,
+    retries={"max_attempts": 3, "mode": "adaptive"}
+)
+
 
 class DynamoDBClient(LoggerMixin):
-    """DynamoDB client wrapper"""
-    
+    """Async DynamoDB client wrapper"""
+
     def __init__(self):
+        self._session = aioboto3.Session(
+            region_name=settings.DYNAMODB_REGION,
+            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY
+        )
         self._client = None
+        self._client_cm = None
         self._resource = None
+        self._resource_cm = None
         self._tables: Dict[str, Any] = {}
-    
-    @property
-    def client(self):
-        """Get DynamoDB client"""
+        # Concurrent first calls must not enter the context managers twice
+        self._setup_lock = asyncio.Lock()
+
+    async def _get_client(self):
+        """Get the async DynamoDB client, creating it on first use"""
         if self._client is None:
-            self._client = boto3.client(
-                'dynamodb',
-                region_name=settings.DYNAMODB_REGION,
-                aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-                aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY
-            )
+            async with self._setup_lock:
+                if self._client is None:
+                    self._client_cm = self._session.client('dynamodb', config=_DYNAMODB_CONFIG)
+                    self._client = await self._client_cm.__aenter__()
         return self._client
-    
-    @property
-    def resource(self):
-        """Get DynamoDB resource"""
+
+    async def _get_resource(self):
+        """Get the async DynamoDB resource, creating it on first use"""
         if self._resource is None:
-            self._resource = boto3.resource(
-                'dynamodb',
-                region_name=settings.DYNAMODB_REGION,
-                aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-                aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY
-            )
+            async with self._setup_lock:
+                if self._resource is None:
+                    self._resource_cm = self._session.resource('dynamodb', config=_DYNAMODB_CONFIG)
+                    self._resource = await self._resource_cm.__aenter__()
         return self._resource
-    
-    def get_table(self, table_name: str):
+
+    async def get_table(self, table_name: str):
         """Get DynamoDB table"""
         if table_name not in self._tables:
             try:
-                table = self.resource.Table(table_name)
-                # Test if table exists
-                table.scan(Limit=1)
-                self._tables[table_name] = table
+                client = await self._get_client()
+                # Cheap metadata-only existence check instead of a read
+                await client.describe_table(TableName=table_name)
+
+                resource = await self._get_resource()
+                self._tables[table_name] = await resource.Table(table_name)
                 self.logger.info(f"Successfully connected to DynamoDB table: {table_name}")
             except ClientError as e:
-                self.logger.warning(f"DynamoDB table access error for {table_name}: {str(e)}")
+                error_code = e.response.get('Error', {}).get('Code', '')
+                if error_code == 'ResourceNotFoundException':
+                    self.logger.warning(f"DynamoDB table not found: {table_name}")
+                else:
+                    self.logger.warning(f"DynamoDB table access error for {table_name}: {str(e)}")
+                # Cache the absent table so we don't re-probe on every lookup
                 self._tables[table_name] = None
-        
+
         return self._tables[table_name]
-    
-    def close(self):
+
+    async def close(self):
         """Close connections"""
-        self._client = None
-        self._resource = None
+        if self._client_cm is not None:
+            await self._client_cm.__aexit__(None, None, None)
+            self._client = None
+            self._client_cm = None
+        if self._resource_cm is not None:
+            await self._resource_cm.__aexit__(None, None, None)
+            self._resource = None
+            self._resource_cm = None
         self._tables.clear()
 
 
 class DatabaseManager(LoggerMixin):
     """Database manager for all database connections"""
-    
+
     def __init__(self):
         self.dynamodb_client = DynamoDBClient()
         self._tables: Dict[str, Optional[Any]] = {}
-    
-    async def initialize(self):
-        """Initialize database connections"""
+
+    async def _probe_table(self, table_key: str, table_name: str):
+        """Resolve one DynamoDB table into the local registry"""
+        self._tables[table_key] = await self.dynamodb_client.get_table(table_name)
+
+    async def initialize(self, content_service: Optional[Any] = None):
+        """Initialize database connections.
+
+        Table probes (and, when a content service is passed, OpenSearch
+        chapter-key prewarming) run concurrently so startup wall time is
+        the slowest probe rather than their sum.
+        """
         self.logger.info("Initializing database connections...")
-        
+
         # Initialize DynamoDB tables
         table_names = {
             'history': settings.QUESTION_HISTORY_TABLE,
             'conversation': settings.CONVERSATION_TABLE,
             'events': settings.EVENTS_TABLE
         }
-        
-        for key, table_name in table_names.items():
-            self._tables[key] = self.dynamodb_client.get_table(table_name)
-        
+
+        tasks = [
+            self._probe_table(key, table_name)
+            for key, table_name in table_names.items()
+        ]
+        if content_service is not None:
+            tasks.append(content_service.prewarm_chapter_keys())
+
+        await asyncio.gather(*tasks)
+
         self.logger.info("Database connections initialized")
-    
+
     def get_table(self, table_key: str) -> Optional[Any]:
         """Get a DynamoDB table by key"""
         return self._tables.get(table_key)
-    
+
     @property
     def history_table(self):
         """Get question history table"""
         return self.get_table('history')
-    
+
     @property
     def conversation_table(self):
         """Get conversation table"""
         return self.get_table('conversation')
-    
+
     @property
     def events_table(self):
         """Get events table"""
         return self.get_table('events')
-    
+
     async def close(self):
         """Close all database connections"""
         self.logger.info("Closing database connections...")
-        self.dynamodb_client.close()
+        await self.dynamodb_client.close()
         self._tables.clear()
         self.logger.info("Database connections closed")
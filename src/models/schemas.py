@@ -2,34 +2,20 @@
 Pydantic models for question generation requests and responses
 """
 import uuid
-from typing import Dict, Any, List, Optional, Union
-from pydantic import BaseModel, Field
-from enum import Enum
+from typing import Dict, Any, List, Literal, Optional, Union
+from pydantic import BaseModel, ConfigDict, Field
 
-
-class QuestionType(str, Enum):
-    """Question type enumeration"""
-    MCQ = "mcq"
-    TRUE_FALSE = "tf"
-    FILL_IN_BLANK = "fib"
-
-
-class DifficultyLevel(str, Enum):
-    """Difficulty level enumeration"""
-    BASIC = "basic"
-    INTERMEDIATE = "intermediate"
-    ADVANCED = "advanced"
-
-
-class BloomsTaxonomy(str, Enum):
-    """Bloom's taxonomy level enumeration"""
-    REMEMBER = "remember"
-    APPLY = "apply"
-    ANALYZE = "analyze"
+# Plain string validation via Literal goes through pydantic's Rust core;
+# the previous str Enums required a Python-level __call__ per value
+QuestionType = Literal["mcq", "tf", "fib"]
+DifficultyLevel = Literal["basic", "intermediate", "advanced"]
+BloomsTaxonomy = Literal["remember", "apply", "analyze"]
 
 
 class QuestionGenerationRequest(BaseModel):
     """Request model for question generation"""
+    model_config = ConfigDict(extra="ignore")
+
     contentId: str = Field(
         default="An Invitation to Health",
         description="Book identifier for content retrieval"
@@ -80,6 +66,8 @@ class QuestionGenerationRequest(BaseModel):
 
 class QuestionGenerationResponse(BaseModel):
     """Response model for question generation"""
+    model_config = ConfigDict(extra="ignore")
+
     status: str = Field(description="Status of the generation request")
     message: str = Field(description="Status message or error description")
     session_id: str = Field(description="Session identifier")
@@ -96,6 +84,8 @@ class QuestionGenerationResponse(BaseModel):
 
 class MCQQuestion(BaseModel):
     """Multiple Choice Question model"""
+    model_config = ConfigDict(extra="ignore")
+
     question_id: str = Field(description="Unique question identifier")
     question: str = Field(description="Question text")
     answer: str = Field(description="Correct answer")
@@ -103,33 +93,39 @@ class MCQQuestion(BaseModel):
     distractors: List[str] = Field(description="Incorrect answer options")
     difficulty: str = Field(description="Question difficulty level")
     blooms_level: str = Field(description="Bloom's taxonomy level")
-    question_type: str = Field(default="mcq", description="Question type")
+    question_type: QuestionType = Field(default="mcq", description="Question type")
 
 
 class TrueFalseQuestion(BaseModel):
     """True/False Question model"""
+    model_config = ConfigDict(extra="ignore")
+
     question_id: str = Field(description="Unique question identifier")
     statement: str = Field(description="Statement to evaluate")
     answer: str = Field(description="TRUE or FALSE")
     explanation: str = Field(description="Answer explanation")
     difficulty: str = Field(description="Question difficulty level")
     blooms_level: str = Field(description="Bloom's taxonomy level")
-    question_type: str = Field(default="tf", description="Question type")
+    question_type: QuestionType = Field(default="tf", description="Question type")
 
 
 class FillInBlankQuestion(BaseModel):
     """Fill-in-the-Blank Question model"""
+    model_config = ConfigDict(extra="ignore")
+
     question_id: str = Field(description="Unique question identifier")
     question: str = Field(description="Question text with blanks")
     answer: List[str] = Field(description="Correct answers for blanks")
     explanation: str = Field(description="Answer explanation")
     difficulty: str = Field(description="Question difficulty level")
     blooms_level: str = Field(description="Bloom's taxonomy level")
-    question_type: str = Field(default="fib", description="Question type")
+    question_type: QuestionType = Field(default="fib", description="Question type")
 
 
 class HealthCheckResponse(BaseModel):
     """Health check response model"""
+    model_config = ConfigDict(extra="ignore")
+
     status: str = Field(description="Health status")
     version: str = Field(description="Application version")
     optimizations: List[str] = Field(description="List of optimizations")
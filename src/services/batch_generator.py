@@ -0,0 +1,237 @@
+"""
+Batched question generation service
+
+Generates several question sets (types and counts) from one LLM call by
+embedding the chapter content once and labelling each requested set with
+a position marker, instead of paying one full prompt per question type.
+"""
+import functools
+import re
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from src.core.logging import LoggerMixin
+from src.services.content_service import get_content_service
+from src.services.llm_service import get_llm_service
+from src.services.mcq_generator import MCQParser
+from src.services.fib_generator import FIBParser
+from src.services.tf_generator import TFParser
+from src.utils.constants import CENGAGE_GUIDELINES_PROMPT_TAIL
+from src.utils.helpers import (
+    calculate_question_distribution,
+    format_combo_guidelines,
+    generate_filename,
+    save_questions_to_file
+)
+
+# (question_type, num_questions, difficulty_distribution, blooms_distribution)
+BatchSpec = Tuple[str, int, Dict[str, float], Dict[str, float]]
+
+# Section markers emitted by the model, e.g. "[1]" at the start of a line
+_SECTION_MARKER_RE = re.compile(r"^\s*\[(\d+)\]", re.MULTILINE)
+
+# Per-type output format blocks, matching the single-type generators
+_FORMAT_BLOCKS = {
+    "mcq": """Format each question exactly as follows:
+QUESTION: [Question text appropriate to difficulty and Bloom's level]
+ANSWER: [Correct answer]
+EXPLANATION: [Explanation of correct answer and why it demonstrates the required cognitive level]
+DISTRACTOR1: [First incorrect option]
+DISTRACTOR2: [Second incorrect option]
+DISTRACTOR3: [Third incorrect option]""",
+    "fib": """Each blank should be indicated by "________" (8 underscores). Format each question exactly as follows:
+QUESTION: [Statement with ________ for blanks, appropriate to difficulty and Bloom's level]
+ANSWER: [Correct answer(s) that should fill the blank(s), if multiple blanks, list each answer separately]
+EXPLANATION: [Explanation of why this is the correct answer and how it demonstrates the required cognitive level]""",
+    "tf": """Format each question exactly as follows:
+STATEMENT: [A clear statement that is either true or false, appropriate to difficulty and Bloom's level]
+ANSWER: [Either "TRUE" or "FALSE" in all caps]
+EXPLANATION: [Explanation of why the statement is true or false, with reference to chapter content]"""
+}
+
+_TYPE_LABELS = {
+    "mcq": "multiple-choice",
+    "fib": "fill-in-the-blank",
+    "tf": "true/false"
+}
+
+
+class BatchQuestionGenerator(LoggerMixin):
+    """Service for generating several question sets in one LLM pass"""
+
+    def __init__(self):
+        self.content_service = get_content_service()
+        self.llm_service = get_llm_service()
+        self.parsers = {
+            "mcq": MCQParser(),
+            "fib": FIBParser(),
+            "tf": TFParser()
+        }
+
+    def generate_batch(
+        self,
+        chapter_name: str,
+        content_id: str,
+        specs: List[BatchSpec],
+        chapter_content: str,
+        learning_objectives: Optional[Union[str, List[str]]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Generate all requested question sets from a single LLM call
+
+        Args:
+            chapter_name: The chapter name
+            content_id: The book identifier
+            specs: One (question_type, count, difficulty_dist, blooms_dist)
+                entry per requested set
+            chapter_content: Pre-retrieved chapter content
+            learning_objectives: Optional learning objectives for context
+
+        Returns:
+            Dictionary keyed by question type with the same response and
+            metadata shape as the single-type generators
+        """
+        if not specs:
+            raise ValueError("At least one batch spec must be provided")
+        if not chapter_content:
+            raise ValueError(f"No content found for chapter '{chapter_name}' in '{content_id}'")
+
+        unknown = [spec[0] for spec in specs if spec[0] not in self.parsers]
+        if unknown:
+            raise ValueError(f"Unknown question types in batch: {unknown}")
+
+        self.logger.info(
+            f"Generating batch of {len(specs)} question sets for chapter: {chapter_name}"
+        )
+
+        # Pre-compute the per-spec breakdown once; it drives both prompt
+        # guidelines and parser metadata assignment
+        breakdowns = [
+            calculate_question_distribution(count, {q_type: 1.0}, diff_dist, blooms_dist)
+            for q_type, count, diff_dist, blooms_dist in specs
+        ]
+
+        prompt = self._create_batch_prompt(chapter_content, specs, breakdowns)
+
+        response_text = self.llm_service.generate_completion(prompt)
+        sections = self._split_sections(response_text, len(specs))
+
+        results: Dict[str, Dict[str, Any]] = {}
+        for index, (spec, breakdown) in enumerate(zip(specs, breakdowns), start=1):
+            q_type, count, diff_dist, blooms_dist = spec
+            section_text = sections.get(index, "")
+
+            parser = self.parsers[q_type]
+            if q_type == "mcq":
+                questions = parser.parse_mcq_response(section_text, breakdown)
+            elif q_type == "fib":
+                questions = parser.parse_fib_response(section_text, breakdown)
+            else:
+                questions = parser.parse_tf_response(section_text, breakdown)
+
+            if not questions:
+                raise ValueError(
+                    f"No valid {q_type} questions could be parsed from batch section [{index}]"
+                )
+
+            filename = generate_filename(
+                chapter_name=chapter_name,
+                difficulty_distribution=diff_dist,
+                blooms_distribution=blooms_dist,
+                question_type=q_type,
+                learning_objectives=learning_objectives
+            )
+            questions_dict = [q.model_dump() for q in questions]
+            save_questions_to_file(questions_dict, filename)
+
+            self.logger.info(
+                f"Batch section [{index}] produced {len(questions)} {q_type} questions"
+            )
+
+            results[q_type] = {
+                "response": questions_dict,
+                "metadata": {
+                    "chapter_name": chapter_name,
+                    "content_id": content_id,
+                    "learning_objectives": learning_objectives,
+                    "num_questions": len(questions),
+                    "difficulty_distribution": diff_dist,
+                    "blooms_taxonomy_distribution": blooms_dist,
+                    "filename": filename
+                }
+            }
+
+        return results
+
+    def _split_sections(self, response_text: str, expected: int) -> Dict[int, str]:
+        """Split the batched response into per-marker sections"""
+        sections: Dict[int, str] = {}
+        markers = list(_SECTION_MARKER_RE.finditer(response_text))
+
+        for i, marker in enumerate(markers):
+            index = int(marker.group(1))
+            start = marker.end()
+            end = markers[i + 1].start() if i + 1 < len(markers) else len(response_text)
+            sections[index] = response_text[start:end]
+
+        if len(sections) < expected:
+            self.logger.warning(
+                f"Expected {expected} batch sections but found {len(sections)}"
+            )
+        return sections
+
+    def _create_batch_prompt(
+        self,
+        chapter_content: str,
+        specs: List[BatchSpec],
+        breakdowns: List[Dict[str, Dict[str, Any]]]
+    ) -> List[str]:
+        """Create one prompt covering every requested question set.
+
+        Returned as a list of segments sent to the LLM as separate content
+        blocks, avoiding one more copy of the chapter content.
+        """
+        parts = [f"""
+        You are a professor writing sophisticated assessment questions for an upper-level university course. The questions will be based on this chapter content:
+
+        {chapter_content}
+
+        Produce every question set described below. Each set is identified by a position marker like [1].
+
+        IMPORTANT FORMATTING INSTRUCTIONS:
+        - Start IMMEDIATELY with "[1]" on its own line, followed by that set's questions
+        - Begin every set with its marker on its own line
+        - DO NOT write ANY introductory text like "Based on the chapter..." or "I'll create..."
+        - DO NOT include ANY preamble, commentary, or text between sets
+        """]
+
+        for index, (spec, breakdown) in enumerate(zip(specs, breakdowns), start=1):
+            q_type, count, diff_dist, blooms_dist = spec
+
+            guidelines = [
+                format_combo_guidelines(
+                    specs_entry['difficulty'], specs_entry['blooms_level'],
+                    q_type, specs_entry['count']
+                )
+                for specs_entry in breakdown.values()
+            ]
+
+            parts.append(f"""
+        [{index}] Create exactly {count} {_TYPE_LABELS[q_type]} questions following these specific guidelines:
+
+        {' '.join(guidelines)}
+
+        {_FORMAT_BLOCKS[q_type]}
+
+        Distribution of questions:
+        {breakdown}
+        """)
+
+        parts.append(CENGAGE_GUIDELINES_PROMPT_TAIL)
+
+        return parts
+
+
+@functools.lru_cache(maxsize=1)
+def get_batch_generator() -> BatchQuestionGenerator:
+    """Get the shared batch question generator instance"""
+    return BatchQuestionGenerator()
@@ -1,83 +1,204 @@
 """
 Content retrieval service using OpenSearch
 """
+import asyncio
+
 import boto3
-from opensearchpy import OpenSearch, RequestsHttpConnection, AWSV4SignerAuth
-from typing import Optional
+from cachetools import TTLCache
+from opensearchpy import AsyncOpenSearch, AIOHttpConnection, AWSV4SignerAsyncAuth
+from typing import Dict, Optional
 
 from src.core.config import settings
-from src.core.logging import LoggerMixin
+from src.core.logging import LoggerMixin, get_logger
+from src.utils.constants import MAX_FILE_SIZE_MB
+
+# Frozen AWS credential snapshot, shared across clients. Walking the
+# boto3 credential-provider chain is expensive, so resolve once and
+# rotate via the background refresh task instead of per request.
+_session_credentials = None
+
+# Refresh comfortably before the typical 1h STS expiry
+_CREDENTIAL_REFRESH_SECONDS = 45 * 60
+
+
+def _resolve_credentials():
+    """Walk the boto3 credential chain and freeze the result"""
+    session = boto3.Session(profile_name=settings.AWS_PROFILE_NAME)
+    return session.get_credentials().get_frozen_credentials()
+
+
+def _get_cached_credentials():
+    """Get the frozen credential snapshot, resolving it on first use"""
+    global _session_credentials
+    if _session_credentials is None:
+        _session_credentials = _resolve_credentials()
+    return _session_credentials
+
+
+async def refresh_credentials_periodically() -> None:
+    """Background task that rotates the frozen snapshot before expiry"""
+    global _session_credentials
+    logger = get_logger(__name__)
+    while True:
+        await asyncio.sleep(_CREDENTIAL_REFRESH_SECONDS)
+        try:
+            _session_credentials = await asyncio.to_thread(_resolve_credentials)
+            logger.info("Refreshed AWS credential snapshot")
+        except Exception as e:
+            logger.error(f"Failed to refresh AWS credentials: {e}")
+
+
+class _StaticCredentials:
+    """Credential view over the frozen snapshot.
+
+    The signer reads these attributes per request; serving them from the
+    snapshot keeps signing free of provider-chain walks while still
+    picking up background refreshes.
+    """
+
+    @property
+    def access_key(self):
+        return _get_cached_credentials().access_key
+
+    @property
+    def secret_key(self):
+        return _get_cached_credentials().secret_key
+
+    @property
+    def token(self):
+        return _get_cached_credentials().token
+
+
+# Chapter-key field per content_id; static per book, invalidated only
+# on explicit request
+_chapter_key_cache: Dict[str, str] = {}
+
+
+def invalidate_chapter_key_cache() -> None:
+    """Clear cached chapter keys (e.g. after a re-index)"""
+    _chapter_key_cache.clear()
+
+
+# Static parts of the OpenSearch query bodies, built once at import.
+# Per-call bodies reference these instead of reallocating them.
+_CONTENT_SORT = [
+    {"metadata.source.metadata.pdf_page_number": "asc"},
+    {"metadata.source.metadata.page_sequence": "asc"}
+]
+_CONTENT_SOURCE = ["value"]
+
+# Chunks fetched per page when streaming chapter content; small pages let
+# network I/O overlap with accumulation and allow early termination once
+# the character budget is hit
+_PAGE_SIZE = 50
+
+
+# OpenSearch index per book title; treated as immutable
+_INDEX_MAP: Dict[str, str] = {
+    "An Invitation to Health": "chunk_357973585",
+    "Steps to writing well": "chunk_1337899796"
+}
 
 
 class IndexMappingService(LoggerMixin):
     """Service for managing OpenSearch index mappings"""
-    
+
     def __init__(self):
-        self.index_map = {
-            "An Invitation to Health": "chunk_357973585",
-            "Steps to writing well": "chunk_1337899796"
-        }
-    
+        self.index_map = _INDEX_MAP
+
     def get_index_for_title(self, title: str) -> str:
         """Get the OpenSearch index name for a given book title"""
-        if title in self.index_map:
-            return self.index_map[title]
-        else:
-            available_titles = list(self.index_map.keys())
-            raise ValueError(f"Title '{title}' not found. Available titles: {available_titles}")
-    
+        try:
+            return _INDEX_MAP[title]
+        except KeyError:
+            # Only materialize the title list on the error path
+            raise ValueError(f"Title '{title}' not found. Available titles: {list(_INDEX_MAP)}")
+
     def get_available_titles(self) -> list:
         """Get all available book titles"""
-        return list(self.index_map.keys())
+        return list(_INDEX_MAP)
 
 
 class OpenSearchClient(LoggerMixin):
     """OpenSearch client wrapper"""
-    
+
     def __init__(self):
         self._client = None
-    
+
     @property
-    def client(self) -> OpenSearch:
-        """Get OpenSearch client"""
+    def client(self) -> AsyncOpenSearch:
+        """Get async OpenSearch client"""
         if self._client is None:
-            session = boto3.Session(profile_name=settings.AWS_PROFILE_NAME)
-            credentials = session.get_credentials()
-            
-            auth = AWSV4SignerAuth(credentials, settings.OPENSEARCH_REGION, 'aoss')
-            self._client = OpenSearch(
+            auth = AWSV4SignerAsyncAuth(_StaticCredentials(), settings.OPENSEARCH_REGION, 'aoss')
+            self._client = AsyncOpenSearch(
                 hosts=[{'host': settings.OPENSEARCH_HOST.replace('https://', ''), 'port': 443}],
                 http_auth=auth,
                 use_ssl=True,
                 verify_certs=True,
-                connection_class=RequestsHttpConnection,
-                pool_maxsize=20
+                connection_class=AIOHttpConnection,
+                pool_maxsize=settings.OPENSEARCH_POOL_MAXSIZE
             )
         return self._client
 
+    async def close(self):
+        """Close the underlying connection pool"""
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
 
 class ContentRetrievalService(LoggerMixin):
     """Service for retrieving content from OpenSearch"""
-    
+
     def __init__(self):
         self.opensearch_client = OpenSearchClient()
         self.index_mapping = IndexMappingService()
-    
-    def _determine_chapter_key(self, content_id: str) -> str:
-        """Determine which metadata field contains chapter information"""
-        current_index = self.index_mapping.get_index_for_title(content_id)
-        
-        # Check toc_level_2_title first
-        level_2_chapters = self._find_chapter_names(current_index, 'toc_level_2_title')
-        
+        # Retrieval is deterministic per (book, chapter, limits), so cache
+        # assembled chapter text and coalesce concurrent misses per key
+        self._content_cache = TTLCache(maxsize=64, ttl=3600)
+        self._content_locks: Dict[tuple, asyncio.Lock] = {}
+        # Loop the shared client and locks are bound to, recorded on first
+        # async use; the sync bridge below submits work to it
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @staticmethod
+    def _chapter_key_from_buckets(level_2_chapters: list) -> str:
+        """Pick the chapter key based on the toc_level_2_title aggregation"""
         if level_2_chapters and 'chapter' in "".join([val['key'].lower() for val in level_2_chapters]):
             return 'toc_level_2_title'
         else:
             return 'toc_level_1_title'
-    
-    def _find_chapter_names(self, index: str, chapter_key: str) -> list:
-        """Find available chapter names using the specified chapter key"""
-        query = {
+
+    async def _determine_chapter_key(self, content_id: str) -> str:
+        """Determine which metadata field contains chapter information"""
+        # The answer is static per book, so one aggregation query per
+        # content_id is enough for the life of the process
+        cached_key = _chapter_key_cache.get(content_id)
+        if cached_key is not None:
+            return cached_key
+
+        current_index = self.index_mapping.get_index_for_title(content_id)
+
+        # Check toc_level_2_title first
+        level_2_chapters = await self._find_chapter_names(current_index, 'toc_level_2_title')
+        chapter_key = self._chapter_key_from_buckets(level_2_chapters)
+
+        _chapter_key_cache[content_id] = chapter_key
+        return chapter_key
+
+    async def prewarm_chapter_keys(self) -> None:
+        """Resolve the chapter key for every known title ahead of traffic"""
+        for title in self.index_mapping.get_available_titles():
+            try:
+                chapter_key = await self._determine_chapter_key(title)
+                self.logger.info(f"Prewarmed chapter key for '{title}': {chapter_key}")
+            except Exception as e:
+                self.logger.warning(f"Failed to prewarm chapter key for '{title}': {e}")
+
+    @staticmethod
+    def _build_chapter_names_query(chapter_key: str) -> dict:
+        """Build the aggregation query listing chapter names for a key"""
+        return {
             "size": 0,
             "aggs": {
                 "chapter_names": {
@@ -88,15 +209,179 @@ class ContentRetrievalService(LoggerMixin):
                 }
             }
         }
-        
+
+    @staticmethod
+    def _build_content_query(chapter_key: str, chapter_name: str, max_chunks: int) -> dict:
+        """Build the content query; only the term filter and size vary"""
+        return {
+            "query": {
+                "term": {
+                    f"metadata.source.metadata.{chapter_key}.keyword": chapter_name
+                }
+            },
+            "sort": _CONTENT_SORT,
+            "_source": _CONTENT_SOURCE,
+            "size": max_chunks
+        }
+
+    async def _find_chapter_names(self, index: str, chapter_key: str) -> list:
+        """Find available chapter names using the specified chapter key.
+
+        Errors propagate: an empty bucket list is a real answer (no titles
+        under that key) that callers may cache, whereas a failed query must
+        stay retryable rather than being mistaken for one.
+        """
+        query = self._build_chapter_names_query(chapter_key)
+
         try:
-            response = self.opensearch_client.client.search(index=index, body=query)
-            return response.get('aggregations', {}).get('chapter_names', {}).get('buckets', [])
+            response = await self.opensearch_client.client.search(index=index, body=query)
         except Exception as e:
             self.logger.error(f"Error finding chapter names in index {index}: {e}")
-            return []
-    
-    def retrieve_chapter_content(
+            raise
+        return response.get('aggregations', {}).get('chapter_names', {}).get('buckets', [])
+
+    async def _msearch(self, index: str, queries: list) -> list:
+        """Submit several queries against an index in one HTTP round-trip"""
+        body = []
+        for query in queries:
+            body.append({"index": index})
+            body.append(query)
+        response = await self.opensearch_client.client.msearch(body=body)
+        return response.get('responses', [])
+
+    async def _msearch_chapter_content(
+        self,
+        index: str,
+        content_id: str,
+        chapter_name: str,
+        max_chunks: int
+    ) -> dict:
+        """Resolve the chapter key and fetch content in a single round-trip.
+
+        On a chapter-key cache miss the aggregation and the content query
+        are pipelined via _msearch, with the content query assuming
+        toc_level_2_title. If the aggregation confirms that key the content
+        response is already in hand; otherwise a single follow-up search
+        with toc_level_1_title is issued.
+        """
+        responses = await self._msearch(index, [
+            self._build_chapter_names_query('toc_level_2_title'),
+            self._build_content_query('toc_level_2_title', chapter_name, max_chunks)
+        ])
+        agg_response, content_response = responses
+
+        # An msearch item can carry an error payload instead of results.
+        # Deriving (and caching) a chapter key from one would pin the wrong
+        # answer for the life of the process, so fail the request instead
+        # and leave the cache empty for a retry.
+        if 'error' in agg_response or 'aggregations' not in agg_response:
+            raise Exception(
+                f"Chapter-name aggregation failed for index {index}: {agg_response.get('error')}"
+            )
+
+        buckets = agg_response['aggregations'].get('chapter_names', {}).get('buckets', [])
+        chapter_key = self._chapter_key_from_buckets(buckets)
+        _chapter_key_cache[content_id] = chapter_key
+        self.logger.debug(f"Using chapter key: {chapter_key}")
+
+        if chapter_key == 'toc_level_2_title':
+            if 'error' in content_response:
+                raise Exception(
+                    f"Content query failed for index {index}: {content_response['error']}"
+                )
+            return content_response
+
+        query_body = self._build_content_query(chapter_key, chapter_name, max_chunks)
+        return await self.opensearch_client.client.search(index=index, body=query_body)
+
+    async def retrieve_chapter_content(
+        self,
+        chapter_name: str,
+        content_id: str,
+        max_chunks: int = None,
+        max_chars: int = None
+    ) -> str:
+        """Retrieve chapter content, serving repeat requests from cache"""
+        self._loop = asyncio.get_running_loop()
+        max_chunks = max_chunks or settings.MAX_CHUNKS
+        max_chars = max_chars or settings.MAX_CHARS
+
+        cache_key = (content_id, chapter_name, max_chunks, max_chars)
+        cached = self._content_cache.get(cache_key)
+        if cached is not None:
+            self.logger.info(f"Serving cached content for chapter: {chapter_name}")
+            return cached
+
+        # Single-flight: concurrent misses for the same chapter wait on one
+        # retrieval instead of stampeding OpenSearch
+        lock = self._content_locks.setdefault(cache_key, asyncio.Lock())
+        try:
+            async with lock:
+                cached = self._content_cache.get(cache_key)
+                if cached is not None:
+                    return cached
+
+                chapter_text = await self._retrieve_chapter_content(
+                    chapter_name, content_id, max_chunks, max_chars
+                )
+                # Cap the memory held by any single entry; oversized chapters
+                # are still returned, just not cached
+                if chapter_text and len(chapter_text) < MAX_FILE_SIZE_MB * 1024 * 1024:
+                    self._content_cache[cache_key] = chapter_text
+                return chapter_text
+        finally:
+            # Evict the per-key lock once this retrieval settles: the keys
+            # include free-form max_chunks/max_chars, so keeping every lock
+            # ever created leaks memory under varied traffic. Waiters
+            # already queued keep their reference to the popped lock, and
+            # anyone arriving later hits the content cache first anyway.
+            self._content_locks.pop(cache_key, None)
+
+    def retrieve_chapter_content_sync(
+        self,
+        chapter_name: str,
+        content_id: str,
+        max_chunks: int = None,
+        max_chars: int = None
+    ) -> str:
+        """Blocking bridge for callers on threads without an event loop.
+
+        The shared aiohttp client, cache locks and in-flight tasks are all
+        bound to the loop that first used them, so the coroutine has to run
+        there: while that loop is alive the call is submitted to it with
+        run_coroutine_threadsafe. If no async traffic has happened yet
+        (standalone scripts, tests), a throwaway service with its own client
+        drives a private loop instead, so the shared client never binds to
+        a loop that is about to close.
+        """
+        loop = self._loop
+        if loop is not None and loop.is_running():
+            future = asyncio.run_coroutine_threadsafe(
+                self.retrieve_chapter_content(
+                    chapter_name=chapter_name,
+                    content_id=content_id,
+                    max_chunks=max_chunks,
+                    max_chars=max_chars
+                ),
+                loop
+            )
+            return future.result()
+
+        async def _retrieve_with_private_client() -> str:
+            service = ContentRetrievalService()
+            try:
+                return await service.retrieve_chapter_content(
+                    chapter_name=chapter_name,
+                    content_id=content_id,
+                    max_chunks=max_chunks,
+                    max_chars=max_chars
+                )
+            finally:
+                await service.opensearch_client.close()
+
+        return asyncio.run(_retrieve_with_private_client())
+
+    async def _retrieve_chapter_content(
         self,
         chapter_name: str,
         content_id: str,
@@ -108,67 +393,102 @@ class ContentRetrievalService(LoggerMixin):
             raise ValueError("Chapter name must be provided")
         if not content_id:
             raise ValueError("Content ID must be provided")
-        
+
         max_chunks = max_chunks or settings.MAX_CHUNKS
         max_chars = max_chars or settings.MAX_CHARS
-        
+
         self.logger.info(f"Retrieving content for chapter: {chapter_name} from {content_id}")
-        
+
         try:
             current_index = self.index_mapping.get_index_for_title(content_id)
             self.logger.info(f"Using OpenSearch index: {current_index}")
         except ValueError as e:
             raise ValueError(f"Unsupported book title: {e}")
-        
-        # Determine the correct chapter key
-        chapter_key = self._determine_chapter_key(content_id)
-        self.logger.debug(f"Using chapter key: {chapter_key}")
-        
-        # Create query for chapter content
-        query_body = {
-            "query": {
-                "term": {
-                    f"metadata.source.metadata.{chapter_key}.keyword": chapter_name
-                }
-            },
-            "sort": [
-                {"metadata.source.metadata.pdf_page_number": "asc"},
-                {"metadata.source.metadata.page_sequence": "asc"}
-            ],
-            "_source": {
-                "excludes": ["embedding"]
-            },
-            "size": max_chunks
-        }
-        
+
+        page_size = min(_PAGE_SIZE, max_chunks)
+
         try:
-            response = self.opensearch_client.client.search(index=current_index, body=query_body)
+            chapter_key = _chapter_key_cache.get(content_id)
+            if chapter_key is not None:
+                self.logger.debug(f"Using chapter key: {chapter_key}")
+                query_body = self._build_content_query(chapter_key, chapter_name, page_size)
+                response = await self.opensearch_client.client.search(index=current_index, body=query_body)
+            else:
+                # Cache miss: pipeline key detection and content retrieval
+                response = await self._msearch_chapter_content(
+                    current_index, content_id, chapter_name, page_size
+                )
+                chapter_key = _chapter_key_cache[content_id]
         except Exception as e:
             raise Exception(f"Search error in index {current_index}: {e}")
-        
+
         hits = response['hits']['hits']
         total_hits = response['hits']['total']['value']
-        
+
         if total_hits == 0:
             self.logger.warning(f"No content found for chapter '{chapter_name}' in '{content_id}'")
             return ""
-        
+
         self.logger.info(f"Found {total_hits} content chunks")
-        
-        # Combine content from all hits
-        chapter_text = ""
-        for hit in hits:
-            chapter_text += hit['_source']['value']
-        
+
+        # Page through the chapter with search_after, prefetching the next
+        # page before processing the current one and stopping as soon as
+        # either budget is exhausted
+        parts = []
+        total_chars = 0
+        chunks_fetched = 0
+        while hits:
+            chunks_fetched += len(hits)
+
+            next_task = None
+            if len(hits) == page_size and chunks_fetched < max_chunks and total_chars < max_chars:
+                next_query = self._build_content_query(
+                    chapter_key, chapter_name, min(page_size, max_chunks - chunks_fetched)
+                )
+                next_query["search_after"] = hits[-1]["sort"]
+                next_task = asyncio.create_task(
+                    self.opensearch_client.client.search(index=current_index, body=next_query)
+                )
+
+            for hit in hits:
+                value = hit['_source']['value']
+                parts.append(value)
+                total_chars += len(value)
+                if total_chars >= max_chars:
+                    break
+
+            if next_task is None:
+                break
+            if total_chars >= max_chars:
+                # The in-flight page is no longer needed
+                next_task.cancel()
+                break
+
+            try:
+                response = await next_task
+            except Exception as e:
+                raise Exception(f"Search error in index {current_index}: {e}")
+            hits = response['hits']['hits']
+
+        chapter_text = "".join(parts)
+
         # Limit content if it exceeds max_chars
         if len(chapter_text) > max_chars:
             self.logger.info(f"Truncating content from {len(chapter_text)} to {max_chars} characters")
             chapter_text = chapter_text[:max_chars]
-        
+
         self.logger.info(f"Retrieved content length: {len(chapter_text)} characters")
         return chapter_text
 
 
+# Process-wide service instance so every caller shares one client and
+# one connection pool instead of rebuilding them per request
+_content_service: Optional[ContentRetrievalService] = None
+
+
 def get_content_service() -> ContentRetrievalService:
-    """Get content retrieval service instance"""
-    return ContentRetrievalService()
+    """Get the shared content retrieval service instance"""
+    global _content_service
+    if _content_service is None:
+        _content_service = ContentRetrievalService()
+    return _content_service
@@ -1,87 +1,161 @@
 """
 Fill-in-the-Blank (FIB) question generation service
 """
+import asyncio
+import functools
+import re
 import uuid
-from typing import Dict, List, Optional, Union, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Union, Any
 
+from src.core.config import settings
 from src.core.logging import LoggerMixin
 from src.models.schemas import FillInBlankQuestion
 from src.services.content_service import get_content_service
 from src.services.llm_service import get_llm_service
-from src.utils.constants import CENGAGE_GUIDELINES
+from src.utils.constants import CENGAGE_GUIDELINES_PROMPT_TAIL
 from src.utils.helpers import (
-    get_difficulty_description,
-    get_blooms_question_guidelines,
     calculate_question_distribution,
     create_question_sequence,
+    format_combo_guidelines,
     generate_filename,
     save_questions_to_file
 )
 
 
+# Constant prompt segments, formatted once at import so each call only pays
+# for the dynamic pieces
+_FIB_PROMPT_HEADER = """
+        You are a professor writing sophisticated fill-in-the-blank questions for an upper-level university course. The questions will be based on this chapter content:
+
+        """
+
+_FIB_PROMPT_INSTRUCTIONS = """
+
+        IMPORTANT FORMATTING INSTRUCTIONS:
+        - Start IMMEDIATELY with your first question using "QUESTION:"
+        - DO NOT write ANY introductory text like "Based on the chapter..." or "I'll create..."
+        - DO NOT include ANY preamble or explanation before the first question
+        - Each blank should be indicated by "________" (8 underscores)
+        - A question may have multiple blanks if appropriate
+
+        Each question should:
+        1. Match the specified difficulty and Bloom's taxonomy level
+        2. Present statements appropriate to the cognitive level required
+        3. Use domain-specific terminology accurately
+        4. Focus on important concepts from the chapter
+
+        Format each question exactly as follows:
+        QUESTION: [Statement with ________ for blanks, appropriate to difficulty and Bloom's level]
+        ANSWER: [Correct answer(s) that should fill the blank(s), if multiple blanks, list each answer separately]
+        EXPLANATION: [Explanation of why this is the correct answer and how it demonstrates the required cognitive level]
+"""
+
+# Extracts every FIB section in one linear pass instead of a cascade of
+# str.split calls that each re-scan and re-allocate the block. Every
+# marker is optional so a partially formed block (typically the last one,
+# truncated by the output-token cap) still yields its leading fields
+_FIB_BLOCK_RE = re.compile(
+    r"\A(?P<question>.*?)"
+    r"(?:ANSWER:(?P<answer>.*?))?"
+    r"(?:EXPLANATION:(?P<explanation>.*))?\Z",
+    re.DOTALL
+)
+
+# Matches "1. answer" style lines in the ANSWER section in one pass
+NUMBERED_ANSWER_RE = re.compile(r"^\s*\d+\.\s+(.*)$", re.MULTILINE)
+
+
+# Blocks are independent, so large batches are parsed on a small shared pool;
+# below this threshold the thread handoff costs more than it saves
+_PARSE_THRESHOLD = 32
+_PARSE_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="fib_parse")
+
+
+def _parse_fib_block(block: str) -> Dict[str, Any]:
+    """Extract the fields of a single FIB block into a plain dict"""
+    question_data = {
+        "question_id": uuid.uuid4().hex,
+        "question": "",
+        "answer": [],
+        "explanation": "",
+        "difficulty": "",
+        "blooms_level": "",
+        "question_type": "fib"
+    }
+
+    # Extract all sections in a single pass
+    match = _FIB_BLOCK_RE.match(block)
+    if match:
+        question_data["question"] = match["question"].strip()
+        if match["explanation"] is not None:
+            question_data["explanation"] = match["explanation"].strip()
+
+        # Numbered answers ("1. foo") in one regex pass; fall back to
+        # plain non-empty lines when the list isn't numbered
+        if match["answer"] is not None:
+            answer_text = match["answer"].strip()
+            items = NUMBERED_ANSWER_RE.findall(answer_text)
+            question_data["answer"] = (
+                [item.strip() for item in items] if items
+                else [line.strip() for line in answer_text.splitlines() if line.strip()]
+            )
+
+    return question_data
+
+
 class FIBParser(LoggerMixin):
     """Parser for Fill-in-the-Blank responses from LLM"""
-    
+
     def parse_fib_response(
         self,
-        response_text: str,
+        response_text: Union[str, Iterable[str]],
         question_breakdown: Dict[str, Dict[str, Any]]
     ) -> List[FillInBlankQuestion]:
-        """Parse Fill-in-the-Blank response and assign metadata programmatically"""
-        question_blocks = response_text.split("QUESTION:")
+        """Parse Fill-in-the-Blank response and assign metadata programmatically.
+
+        Accepts either the full response text or an iterable of
+        QUESTION-delimited blocks (e.g. from LLMService.stream_blocks),
+        in which case blocks are parsed as they arrive.
+        """
+        if isinstance(response_text, str):
+            # Full response in hand: parse big batches on the shared pool
+            # filter(None, ...) strips each block exactly once
+            blocks = list(filter(None, (b.strip() for b in response_text.split("QUESTION:"))))
+            if len(blocks) >= _PARSE_THRESHOLD:
+                parsed_blocks = _PARSE_EXECUTOR.map(_parse_fib_block, blocks)
+            else:
+                parsed_blocks = map(_parse_fib_block, blocks)
+        else:
+            # Streamed blocks: parse each one as it arrives
+            parsed_blocks = (
+                _parse_fib_block(b) for b in (x.strip() for x in response_text) if b
+            )
         questions = []
-        
-        # Create sequence of difficulty/blooms assignments
-        question_sequence = create_question_sequence(question_breakdown)
-        question_index = 0
-        
-        for block in [b.strip() for b in question_blocks if b.strip()]:
-            question_data = {
-                "question_id": str(uuid.uuid4()),
-                "question": "",
-                "answer": [],
-                "explanation": "",
-                "difficulty": "",
-                "blooms_level": "",
-                "question_type": "fib"
-            }
-            
-            # Extract question content
-            if "ANSWER:" in block:
-                question_data["question"] = block.split("ANSWER:")[0].strip()
-                block = "ANSWER:" + block.split("ANSWER:")[1]
-            
-            # Extract answer(s)
-            if "ANSWER:" in block and "EXPLANATION:" in block:
-                answer_text = block.split("ANSWER:")[1].split("EXPLANATION:")[0].strip()
-                answer_lines = answer_text.split('\n')
-                
-                for line in answer_lines:
-                    line = line.strip()
-                    # Check if line starts with a number followed by a period
-                    if line and (line[0].isdigit() and '. ' in line):
-                        # Remove the numbering and add to the list
-                        answer_item = line.split('. ', 1)[1].strip()
-                        question_data["answer"].append(answer_item)
-                    elif line:  # If there's text but not in numbered format
-                        question_data["answer"].append(line)
-                
-                block = "EXPLANATION:" + block.split("EXPLANATION:")[1]
-            
-            # Extract explanation
-            if "EXPLANATION:" in block:
-                explanation_text = block.split("EXPLANATION:")[1]
-                question_data["explanation"] = explanation_text.strip()
-            
+
+        # Iterate the difficulty/blooms assignments alongside the blocks
+        seq_iter = iter(create_question_sequence(question_breakdown))
+
+        for question_data in parsed_blocks:
+            # A block with no question text carries nothing to salvage;
+            # skip it before it consumes a difficulty/blooms slot or lands
+            # as an empty question in the saved output
+            if not question_data["question"]:
+                self.logger.warning("Skipping FIB block with no question text")
+                continue
+
             # Programmatically assign difficulty and blooms_level
-            if question_index < len(question_sequence):
-                difficulty, blooms_level = question_sequence[question_index]
-                question_data["difficulty"] = difficulty
-                question_data["blooms_level"] = blooms_level
-                question_index += 1
-            
+            pair = next(seq_iter, None)
+            if pair is not None:
+                question_data["difficulty"], question_data["blooms_level"] = pair
+
             try:
-                question = FillInBlankQuestion(**question_data)
+                if settings.VALIDATE_PARSED:
+                    question = FillInBlankQuestion.model_validate(question_data)
+                else:
+                    # The parser builds this dict itself, so skip per-field
+                    # validation on the hot path
+                    question = FillInBlankQuestion.model_construct(**question_data)
                 questions.append(question)
             except Exception as e:
                 self.logger.warning(f"Failed to create FillInBlankQuestion from data: {e}")
@@ -139,7 +213,10 @@ class FIBGenerator(LoggerMixin):
         # Get chapter content
         if chapter_content is None:
             self.logger.info("No chapter content provided, retrieving from OpenSearch...")
-            chapter_content = self.content_service.retrieve_chapter_content(
+            # Generators run on worker threads without an event loop; the
+            # sync bridge routes retrieval to the loop the shared client
+            # is bound to.
+            chapter_content = self.content_service.retrieve_chapter_content_sync(
                 chapter_name=chapter_name,
                 content_id=content_id,
                 max_chunks=max_chunks,
@@ -170,17 +247,88 @@ class FIBGenerator(LoggerMixin):
             blooms_taxonomy_distribution
         )
         
-        # Generate FIB questions using LLM
+        # Generate FIB questions using LLM, parsing blocks as they stream in
         self.logger.info("Generating fill-in-the-blank questions...")
-        fib_response = self.llm_service.generate_completion(prompt)
-        
-        # Parse response
-        questions = self.parser.parse_fib_response(fib_response, question_breakdown)
+        fib_blocks = self.llm_service.stream_blocks(prompt)
+        questions = self.parser.parse_fib_response(fib_blocks, question_breakdown)
         
         if not questions:
             raise ValueError("No valid fill-in-the-blank questions could be parsed from LLM response")
         
-        # Generate filename and save
+        return self._finalize(
+            questions, chapter_name, content_id, learning_objectives,
+            difficulty_distribution, blooms_taxonomy_distribution
+        )
+
+    async def agenerate_fill_in_blank(
+        self,
+        chapter_name: str,
+        content_id: str,
+        learning_objectives: Optional[Union[str, List[str]]] = None,
+        num_questions: int = 10,
+        difficulty_distribution: Dict[str, float] = {"advanced": 1.0},
+        blooms_taxonomy_distribution: Dict[str, float] = {"analyze": 1.0},
+        chapter_content: Optional[str] = None,
+        max_chunks: Optional[int] = None,
+        max_chars: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Async variant of generate_fill_in_blank.
+
+        Awaitable from an event loop so the FIB call can overlap other LLM
+        calls (e.g. MCQ for the same chapter) via asyncio.gather.
+        """
+        self.logger.info(f"Generating {num_questions} fill-in-the-blank questions for chapter: {chapter_name}")
+
+        if chapter_content is None:
+            chapter_content = await self.content_service.retrieve_chapter_content(
+                chapter_name=chapter_name,
+                content_id=content_id,
+                max_chunks=max_chunks,
+                max_chars=max_chars
+            )
+
+        if not chapter_content:
+            raise ValueError(f"No content found for chapter '{chapter_name}' in '{content_id}'")
+
+        question_breakdown = calculate_question_distribution(
+            num_questions,
+            {"fib": 1.0},
+            difficulty_distribution,
+            blooms_taxonomy_distribution
+        )
+
+        prompt = self._create_fib_prompt(
+            chapter_content,
+            num_questions,
+            question_breakdown,
+            difficulty_distribution,
+            blooms_taxonomy_distribution
+        )
+
+        response_text = await self.llm_service.agenerate_completion(prompt)
+        questions = self.parser.parse_fib_response(response_text, question_breakdown)
+
+        if not questions:
+            raise ValueError("No valid fill-in-the-blank questions could be parsed from LLM response")
+
+        # Serialization and the disk write run on a worker thread so the
+        # event loop stays free for other in-flight generations
+        return await asyncio.to_thread(
+            self._finalize,
+            questions, chapter_name, content_id, learning_objectives,
+            difficulty_distribution, blooms_taxonomy_distribution
+        )
+
+    def _finalize(
+        self,
+        questions: List[FillInBlankQuestion],
+        chapter_name: str,
+        content_id: str,
+        learning_objectives: Optional[Union[str, List[str]]],
+        difficulty_distribution: Dict[str, float],
+        blooms_taxonomy_distribution: Dict[str, float]
+    ) -> Dict[str, Any]:
+        """Save the questions and assemble the response payload"""
         filename = generate_filename(
             chapter_name=chapter_name,
             difficulty_distribution=difficulty_distribution,
@@ -188,13 +336,13 @@ class FIBGenerator(LoggerMixin):
             question_type="fib",
             learning_objectives=learning_objectives
         )
-        
+
         # Convert questions to dict format for saving
-        questions_dict = [q.dict() for q in questions]
+        questions_dict = [q.model_dump() for q in questions]
         save_questions_to_file(questions_dict, filename)
-        
+
         self.logger.info(f"Generated {len(questions)} fill-in-the-blank questions and saved to {filename}")
-        
+
         return {
             "response": questions_dict,
             "metadata": {
@@ -207,7 +355,7 @@ class FIBGenerator(LoggerMixin):
                 "filename": filename
             }
         }
-    
+
     def _create_fib_prompt(
         self,
         chapter_content: str,
@@ -215,64 +363,32 @@ class FIBGenerator(LoggerMixin):
         question_breakdown: Dict[str, Dict[str, Any]],
         difficulty_distribution: Dict[str, float],
         blooms_taxonomy_distribution: Dict[str, float]
-    ) -> str:
-        """Create the prompt for Fill-in-the-Blank generation"""
-        
-        # Generate guidelines for each combination
-        all_guidelines = []
-        for combo_key, specs in question_breakdown.items():
-            difficulty = specs['difficulty']
-            blooms_level = specs['blooms_level']
-            count = specs['count']
-            
-            guidelines = get_blooms_question_guidelines(blooms_level, "fib")
-            difficulty_desc = get_difficulty_description(difficulty)
-            
-            all_guidelines.append(f"""
-For {count} questions at {difficulty.upper()} difficulty and {blooms_level.upper()} Bloom's level:
-- Difficulty: {difficulty_desc}
-- Bloom's Level Guidelines: {guidelines}
-            """)
-        
-        prompt = f"""
-        You are a professor writing sophisticated fill-in-the-blank questions for an upper-level university course. The questions will be based on this chapter content:
-
-        {chapter_content}
-
-        Create exactly {num_questions} fill-in-the-blank questions following these specific guidelines:
+    ) -> List[str]:
+        """Create the prompt for Fill-in-the-Blank generation as segments.
 
-        {' '.join(all_guidelines)}
-
-        IMPORTANT FORMATTING INSTRUCTIONS:
-        - Start IMMEDIATELY with your first question using "QUESTION:" 
-        - DO NOT write ANY introductory text like "Based on the chapter..." or "I'll create..."
-        - DO NOT include ANY preamble or explanation before the first question
-        - Each blank should be indicated by "________" (8 underscores)
-        - A question may have multiple blanks if appropriate
+        The segments go to the LLM as separate content blocks, so the
+        (potentially tens-of-KB) chapter content is never copied into a
+        joined prompt string.
+        """
+        parts = [
+            _FIB_PROMPT_HEADER,
+            chapter_content,
+            f"\n\n        Create exactly {num_questions} fill-in-the-blank questions following these specific guidelines:\n"
+        ]
 
-        Each question should:
-        1. Match the specified difficulty and Bloom's taxonomy level
-        2. Present statements appropriate to the cognitive level required
-        3. Use domain-specific terminology accurately
-        4. Focus on important concepts from the chapter
+        for specs in question_breakdown.values():
+            parts.append(format_combo_guidelines(
+                specs['difficulty'], specs['blooms_level'], "fib", specs['count']
+            ))
 
-        Format each question exactly as follows:
-        QUESTION: [Statement with ________ for blanks, appropriate to difficulty and Bloom's level]
-        ANSWER: [Correct answer(s) that should fill the blank(s), if multiple blanks, list each answer separately]
-        EXPLANATION: [Explanation of why this is the correct answer and how it demonstrates the required cognitive level]
+        parts.append(_FIB_PROMPT_INSTRUCTIONS)
+        parts.append(f"\n        Distribution of questions:\n        {question_breakdown}\n")
+        parts.append(CENGAGE_GUIDELINES_PROMPT_TAIL)
 
-        Distribution of questions:
-        {question_breakdown}
-        
-        Make sure to vary the cognitive demands according to the Bloom's taxonomy levels specified.
-        
-        Follow these Cengage guidelines:
-        {CENGAGE_GUIDELINES}
-        """
-        
-        return prompt
+        return parts
 
 
+@functools.lru_cache(maxsize=1)
 def get_fib_generator() -> FIBGenerator:
-    """Get Fill-in-the-Blank generator instance"""
+    """Get the shared Fill-in-the-Blank generator instance"""
     return FIBGenerator()
@@ -1,46 +1,100 @@
 """
 LLM service for question generation
 """
+import asyncio
+import functools
+import os
 import re
-import json
-from typing import Generator, List
+import threading
+
+import time
+
+import orjson
+from typing import Generator, Iterator, List, Union
+from llama_index.core.llms import ChatMessage, MessageRole, TextBlock
 from llama_index.llms.bedrock_converse import BedrockConverse
 
 from src.core.config import settings
 from src.core.logging import LoggerMixin
 
+# Compiled once at import; per-call re.findall would recompile the pattern
+_JSON_FENCE_RE = re.compile(r"```(?:json)?(.*?)```", re.DOTALL)
+
+# Process-wide BedrockConverse client, shared by all generators so that the
+# boto session, AWS profile lookup and HTTP connection pool are set up once
+_llm = None
+_llm_lock = threading.Lock()
+
+# Cap on in-flight LLM calls: under load, unbounded fan-out trips provider
+# rate limits and the resulting retries blow up tail latency. The async
+# and sync entry points are capped separately (an asyncio semaphore can't
+# be shared with worker threads), so when both paths carry traffic the
+# worst-case total in flight is twice the configured limit.
+_MAX_LLM_CONCURRENCY = int(os.getenv("QG_MAX_LLM_CONCURRENCY", "16"))
+_LLM_SEMAPHORE = asyncio.Semaphore(_MAX_LLM_CONCURRENCY)
+_LLM_SYNC_SEMAPHORE = threading.Semaphore(_MAX_LLM_CONCURRENCY)
+
+# Per-call ceiling so one stuck completion can't hold a semaphore slot
+# (and its caller) indefinitely; enforced by wait_for on the async path
+# and by a deadline over the delta stream on the sync one
+_LLM_TIMEOUT_S = float(os.getenv("QG_LLM_TIMEOUT_S", "300"))
+
 
 class LLMService(LoggerMixin):
     """Service for Large Language Model operations"""
-    
-    def __init__(self):
-        self._llm = None
-    
+
     @property
     def llm(self) -> BedrockConverse:
-        """Get LLM instance"""
-        if self._llm is None:
-            self._llm = BedrockConverse(
-                model=settings.LLM_MODEL,
-                profile_name=settings.AWS_PROFILE_NAME,
-                region_name=settings.LLM_REGION,
-                max_tokens=settings.LLM_MAX_TOKENS,
-            )
-            self.logger.info(f"Initialized LLM with model: {settings.LLM_MODEL}")
-        return self._llm
+        """Get the shared LLM instance, creating it on first use"""
+        global _llm
+        if _llm is None:
+            with _llm_lock:
+                if _llm is None:
+                    _llm = BedrockConverse(
+                        model=settings.LLM_MODEL,
+                        profile_name=settings.AWS_PROFILE_NAME,
+                        region_name=settings.LLM_REGION,
+                        max_tokens=settings.LLM_MAX_TOKENS,
+                    )
+                    self.logger.info(f"Initialized LLM with model: {settings.LLM_MODEL}")
+        return _llm
     
-    def generate_completion(self, prompt: str) -> str:
+    def _stream_deltas(self, prompt: Union[str, List[str]]) -> Iterator[str]:
+        """Yield completion deltas for a prompt.
+
+        A plain string goes through the completion API; a list of segments
+        is sent as separate content blocks over the chat API, so large
+        pieces like chapter content are never re-joined into one prompt
+        string client-side.
+
+        The whole stream runs against the _LLM_TIMEOUT_S deadline, so a
+        completion trickling in slowly can't hold a sync semaphore slot
+        indefinitely (the async path gets the same ceiling from wait_for).
+        """
+        if isinstance(prompt, str):
+            stream = self.llm.stream_complete(prompt)
+        else:
+            message = ChatMessage(
+                role=MessageRole.USER,
+                blocks=[TextBlock(text=part) for part in prompt]
+            )
+            stream = self.llm.stream_chat([message])
+
+        deadline = time.monotonic() + _LLM_TIMEOUT_S
+        for r in stream:
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"timed out after {_LLM_TIMEOUT_S}s")
+            yield r.delta
+
+    def generate_completion(self, prompt: Union[str, List[str]]) -> str:
         """Generate completion using the LLM"""
         try:
             self.logger.debug(f"Generating completion for prompt of length: {len(prompt)}")
-            
+
             # Use streaming approach for better performance
-            response_deltas = []
-            stream_response = self.llm.stream_complete(prompt)
-            
-            for r in stream_response:
-                response_deltas.append(r.delta)
-            
+            with _LLM_SYNC_SEMAPHORE:
+                response_deltas = list(self._stream_deltas(prompt))
+
             completion = "".join(response_deltas)
             self.logger.debug(f"Generated completion of length: {len(completion)}")
             
@@ -50,11 +104,92 @@ class LLMService(LoggerMixin):
             self.logger.error(f"Error generating completion: {str(e)}")
             raise Exception(f"LLM completion error: {str(e)}")
     
+    async def agenerate_completion(self, prompt: Union[str, List[str]]) -> str:
+        """Generate a completion without blocking the event loop.
+
+        Lets callers overlap several LLM calls (e.g. MCQ and FIB for the
+        same chapter) with asyncio.gather instead of serializing them.
+        Accepts a string or, like generate_completion, a list of segments
+        sent as separate content blocks.
+        """
+        try:
+            self.logger.debug(f"Generating async completion for prompt of length: {len(prompt)}")
+
+            async with _LLM_SEMAPHORE:
+                completion = await asyncio.wait_for(
+                    self._acollect_completion(prompt), timeout=_LLM_TIMEOUT_S
+                )
+
+            self.logger.debug(f"Generated completion of length: {len(completion)}")
+
+            return completion
+
+        except asyncio.TimeoutError:
+            self.logger.error(f"LLM completion timed out after {_LLM_TIMEOUT_S}s")
+            raise Exception(f"LLM completion error: timed out after {_LLM_TIMEOUT_S}s")
+        except Exception as e:
+            self.logger.error(f"Error generating completion: {str(e)}")
+            raise Exception(f"LLM completion error: {str(e)}")
+
+    async def _acollect_completion(self, prompt: Union[str, List[str]]) -> str:
+        """Collect the full async completion for a prompt"""
+        response_deltas = []
+        if isinstance(prompt, str):
+            stream_response = await self.llm.astream_complete(prompt)
+        else:
+            message = ChatMessage(
+                role=MessageRole.USER,
+                blocks=[TextBlock(text=part) for part in prompt]
+            )
+            stream_response = await self.llm.astream_chat([message])
+
+        async for r in stream_response:
+            response_deltas.append(r.delta)
+
+        return "".join(response_deltas)
+
+    def stream_blocks(self, prompt: Union[str, List[str]], sentinel: str = "QUESTION:") -> Iterator[str]:
+        """Stream sentinel-delimited blocks as the completion arrives.
+
+        Keeps a rolling buffer over the delta stream and yields each block
+        (without its sentinel) as soon as the following sentinel shows up,
+        so callers can parse the first question while the model is still
+        generating the last one. Text before the first sentinel (preamble
+        the prompt forbids anyway) is dropped.
+        """
+        # Streaming counts against the shared concurrency cap like the
+        # collecting entry points; held for the life of the delta stream
+        _LLM_SYNC_SEMAPHORE.acquire()
+        try:
+            sentinel_len = len(sentinel)
+            buffer = ""
+
+            for delta in self._stream_deltas(prompt):
+                buffer += delta
+                while True:
+                    start = buffer.find(sentinel)
+                    if start == -1:
+                        break
+                    next_start = buffer.find(sentinel, start + sentinel_len)
+                    if next_start == -1:
+                        break
+                    yield buffer[start + sentinel_len:next_start]
+                    buffer = buffer[next_start:]
+
+            start = buffer.find(sentinel)
+            if start != -1:
+                yield buffer[start + sentinel_len:]
+
+        except Exception as e:
+            self.logger.error(f"Error streaming completion: {str(e)}")
+            raise Exception(f"LLM completion error: {str(e)}")
+        finally:
+            _LLM_SYNC_SEMAPHORE.release()
+
     def strip_json_markers(self, json_string: str) -> str:
         """Strip triple backticks and 'json' from a JSON-formatted string"""
-        pattern = r"```(?:json)?(.*?)```"
-        matches = re.findall(pattern, json_string, re.DOTALL)
-        
+        matches = _JSON_FENCE_RE.findall(json_string)
+
         if matches:
             return "".join(matches).strip()
         else:
@@ -67,12 +202,12 @@ class LLMService(LoggerMixin):
             clean_completion = self.strip_json_markers(completion)
             
             # Parse JSON
-            result = json.loads(clean_completion)
+            result = orjson.loads(clean_completion)
             self.logger.debug("Successfully parsed JSON response")
-            
+
             return result
-            
-        except json.JSONDecodeError as e:
+
+        except orjson.JSONDecodeError as e:
             self.logger.error(f"Error parsing JSON response: {str(e)}")
             raise Exception(f"Invalid JSON response from LLM: {str(e)}")
         except Exception as e:
@@ -80,6 +215,7 @@ class LLMService(LoggerMixin):
             raise
 
 
+@functools.lru_cache(maxsize=1)
 def get_llm_service() -> LLMService:
-    """Get LLM service instance"""
+    """Get the shared LLM service instance"""
     return LLMService()
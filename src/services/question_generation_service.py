@@ -2,8 +2,11 @@
 Main question generation service that orchestrates all question types
 """
 import asyncio
-import concurrent.futures
-import datetime
+import functools
+import logging
+import os
+import time
+from dataclasses import dataclass
 from typing import Dict, List, Optional, Union, Any, Tuple
 
 from src.core.logging import LoggerMixin
@@ -12,18 +15,49 @@ from src.services.content_service import get_content_service
 from src.services.mcq_generator import get_mcq_generator
 from src.services.fib_generator import get_fib_generator
 from src.services.tf_generator import get_tf_generator
+from src.services.batch_generator import get_batch_generator
 from src.utils.helpers import calculate_question_distribution
 from src.utils.constants import RESPONSE_SUCCESS_TEMPLATE, RESPONSE_ERROR_TEMPLATE
 
 
+# Multi-type requests up to this size go out as one batched LLM call; past
+# it the single response risks blowing the model's output-token budget, so
+# we fall back to one call per type in parallel
+_BATCH_MAX_QUESTIONS = int(os.getenv("QG_BATCH_MAX_QUESTIONS", "30"))
+
+
+@dataclass(frozen=True, slots=True)
+class GenContext:
+    """Per-request inputs shared by every question-type worker.
+
+    Boxed once per request so workers take one argument instead of
+    re-threading six, and new shared fields don't touch the signature
+    chain.
+    """
+    chapter_name: str
+    content_id: str
+    learning_objectives: Optional[Union[str, List[str]]]
+    chapter_content: str
+    max_chunks: Optional[int]
+    max_chars: Optional[int]
+
+
 class QuestionGenerationService(LoggerMixin):
     """Main service for generating questions using multiple generators in parallel"""
-    
+
     def __init__(self):
         self.content_service = get_content_service()
         self.mcq_generator = get_mcq_generator()
         self.fib_generator = get_fib_generator()
         self.tf_generator = get_tf_generator()
+        self.batch_generator = get_batch_generator()
+        # Dispatch table for the per-type workers; all three share the same
+        # keyword signature
+        self._generators = {
+            "mcq": self.mcq_generator.agenerate_mcqs,
+            "fib": self.fib_generator.agenerate_fill_in_blank,
+            "tf": self.tf_generator.agenerate_true_false
+        }
     
     async def generate_questions(
         self,
@@ -40,21 +74,24 @@ class QuestionGenerationService(LoggerMixin):
         Returns:
             Question generation response
         """
-        start_time = datetime.datetime.utcnow()
+        start_time = time.perf_counter()
         status = "success"
         error_message = ""
         all_question_data = {}
         files_generated = []
         
         self.logger.info(f"Processing question generation request for source: {source_id}")
-        self.logger.info(f"Request: {request.dict()}")
+        # Serializing the full request is only worth it when debug logging
+        # is actually enabled
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Request: %s", request.model_dump_json())
         
         try:
             # OPTIMIZATION 1: Generate shared content ONCE
             self.logger.info("🚀 OPTIMIZATION: Generating shared content once...")
-            content_start_time = datetime.datetime.utcnow()
+            content_start_time = time.perf_counter()
             
-            chapter_content = self.content_service.retrieve_chapter_content(
+            chapter_content = await self.content_service.retrieve_chapter_content(
                 chapter_name=request.chapter_name,
                 content_id=request.contentId,
                 max_chunks=request.max_chunks,
@@ -64,7 +101,7 @@ class QuestionGenerationService(LoggerMixin):
             if not chapter_content:
                 raise ValueError(f"No content found for chapter '{request.chapter_name}' in '{request.contentId}'")
             
-            content_time = (datetime.datetime.utcnow() - content_start_time).total_seconds()
+            content_time = time.perf_counter() - content_start_time
             self.logger.info(f"✅ Shared content generated in {content_time:.2f} seconds (length: {len(chapter_content)} characters)")
             
             # Calculate question distribution
@@ -82,33 +119,75 @@ class QuestionGenerationService(LoggerMixin):
             
             # OPTIMIZATION 2: Run question generators in TRUE PARALLEL
             self.logger.info("🚀 OPTIMIZATION: Running question generators in TRUE PARALLEL...")
-            parallel_start_time = datetime.datetime.utcnow()
+            parallel_start_time = time.perf_counter()
             
-            # Generate questions in parallel
-            results = await self._generate_questions_parallel(
-                type_groups=type_groups,
+            # OPTIMIZATION 3: small multi-type requests go out as one
+            # batched LLM call, paying one round-trip instead of one per
+            # type; anything else (or a batch failure) uses the parallel
+            # per-type path
+            ctx = GenContext(
+                chapter_name=request.chapter_name,
+                content_id=request.contentId,
+                learning_objectives=request.learning_objectives,
                 chapter_content=chapter_content,
-                request=request
+                max_chunks=request.max_chunks,
+                max_chars=request.max_chars
             )
-            
-            parallel_time = (datetime.datetime.utcnow() - parallel_start_time).total_seconds()
+
+            batch_results = None
+            if len(type_groups) > 1 and request.total_questions <= _BATCH_MAX_QUESTIONS:
+                try:
+                    batch_results = await asyncio.to_thread(
+                        self._generate_batch_sync, type_groups, ctx
+                    )
+                except Exception as e:
+                    self.logger.warning(
+                        f"Batched generation failed, falling back to parallel per-type calls: {e}"
+                    )
+
+            if batch_results is not None:
+                for question_type, file_name, question_data, error in batch_results:
+                    if error:
+                        raise Exception(f"Error in {question_type}: {error}")
+                    if file_name:
+                        files_generated.append(file_name)
+                    all_question_data[question_type] = question_data
+            else:
+                # Generate questions in parallel, processing each type's
+                # result the moment its generator finishes rather than
+                # waiting for the slowest one before doing any bookkeeping.
+                # Wrapped in tasks so the error path below can cancel the
+                # siblings instead of leaving them running (and writing
+                # files) behind an error response.
+                tasks = [
+                    asyncio.ensure_future(coro)
+                    for coro in self._submit_question_generation(type_groups, ctx)
+                ]
+                try:
+                    for completed in asyncio.as_completed(tasks):
+                        result = await completed
+
+                        question_type, file_name, question_data, error = result
+
+                        if error:
+                            raise Exception(f"Error in {question_type}: {error}")
+
+                        if file_name:
+                            files_generated.append(file_name)
+                        all_question_data[question_type] = question_data
+                finally:
+                    pending = [task for task in tasks if not task.done()]
+                    if pending:
+                        for task in pending:
+                            task.cancel()
+                        # Drain cancellations so no task dies with an
+                        # unretrieved exception after we return
+                        await asyncio.gather(*pending, return_exceptions=True)
+
+            parallel_time = time.perf_counter() - parallel_start_time
             self.logger.info(f"✅ TRUE parallel question generation completed in {parallel_time:.2f} seconds")
-            
-            # Process results
-            for result in results:
-                if isinstance(result, Exception):
-                    raise result
-                
-                question_type, file_name, question_data, error = result
-                
-                if error:
-                    raise Exception(f"Error in {question_type}: {error}")
-                
-                if file_name:
-                    files_generated.append(file_name)
-                all_question_data[question_type] = question_data
-            
-            total_time = (datetime.datetime.utcnow() - start_time).total_seconds()
+
+            total_time = time.perf_counter() - start_time
             
             learning_obj_str = f" with learning objectives: {request.learning_objectives}" if request.learning_objectives else ""
             
@@ -166,137 +245,191 @@ class QuestionGenerationService(LoggerMixin):
             type_groups[q_type].append(config)
         return type_groups
     
-    async def _generate_questions_parallel(
+    def _submit_question_generation(
         self,
         type_groups: Dict[str, List[Dict[str, Any]]],
-        chapter_content: str,
-        request: QuestionGenerationRequest
+        ctx: GenContext
     ) -> List[Any]:
-        """Generate questions in parallel using ThreadPoolExecutor"""
-        
-        loop = asyncio.get_event_loop()
-        
-        with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
-            # Create futures for each question type
-            futures = []
-            
-            for question_type, configs in type_groups.items():
-                # Create combined distributions for this question type
-                total_for_type = sum([config['count'] for config in configs])
-                difficulty_dist_for_type = {}
-                blooms_dist_for_type = {}
-                
-                for config in configs:
-                    diff = config['difficulty']
-                    blooms = config['blooms_level']
-                    count = config['count']
-                    
-                    if diff not in difficulty_dist_for_type:
-                        difficulty_dist_for_type[diff] = 0
-                    if blooms not in blooms_dist_for_type:
-                        blooms_dist_for_type[blooms] = 0
-                    
-                    difficulty_dist_for_type[diff] += count / total_for_type
-                    blooms_dist_for_type[blooms] += count / total_for_type
-                
-                # Submit task to thread pool
-                future = loop.run_in_executor(
-                    executor,
-                    self._generate_single_question_type_sync,
-                    question_type,
-                    configs,
-                    chapter_content,
-                    request.chapter_name,
-                    request.contentId,
-                    request.learning_objectives,
-                    difficulty_dist_for_type,
-                    blooms_dist_for_type,
-                    request.max_chunks,
-                    request.max_chars
-                )
-                futures.append(future)
-            
-            # Wait for all futures to complete
-            self.logger.info(f"⚡ Running {len(futures)} question generators in parallel threads...")
-            results = await asyncio.gather(*futures, return_exceptions=True)
-        
-        return results
-    
-    def _generate_single_question_type_sync(
+        """Kick off one generator per question type and return the awaitables.
+
+        The per-type generators are coroutines awaiting the async LLM
+        client, so concurrent calls share the event loop instead of
+        occupying a thread each while blocked on HTTP. Callers consume them
+        with asyncio.as_completed so results are processed as each
+        generator finishes.
+        """
+        coros = []
+
+        for question_type, configs in type_groups.items():
+            # Create combined distributions for this question type
+            total_for_type, difficulty_dist_for_type, blooms_dist_for_type = self._compute_type_dists(configs)
+
+            coros.append(self._agenerate_single_question_type(
+                ctx,
+                question_type,
+                total_for_type,
+                difficulty_dist_for_type,
+                blooms_dist_for_type
+            ))
+
+        if len(coros) > 1:
+            self.logger.info(f"⚡ Running {len(coros)} question generators concurrently...")
+        return coros
+
+    def _generate_batch_sync(
         self,
+        type_groups: Dict[str, List[Dict[str, Any]]],
+        ctx: GenContext
+    ) -> List[Tuple[str, Optional[str], Optional[Dict[str, Any]], Optional[str]]]:
+        """Generate every requested question type from a single LLM call.
+
+        Returns results in the same per-type tuple shape as
+        _generate_single_question_type_sync so the caller's bookkeeping is
+        identical for both paths.
+        """
+        specs = []
+        for question_type, configs in type_groups.items():
+            total_for_type, difficulty_dist_for_type, blooms_dist_for_type = self._compute_type_dists(configs)
+            specs.append((question_type, total_for_type, difficulty_dist_for_type, blooms_dist_for_type))
+
+        self.logger.info(f"⚡ Running one batched LLM call for {len(specs)} question types...")
+
+        batch = self.batch_generator.generate_batch(
+            chapter_name=ctx.chapter_name,
+            content_id=ctx.content_id,
+            specs=specs,
+            chapter_content=ctx.chapter_content,
+            learning_objectives=ctx.learning_objectives
+        )
+
+        return [
+            (
+                question_type,
+                result.get('metadata', {}).get('filename'),
+                {"response": result.get('response', [])},
+                None
+            )
+            for question_type, result in batch.items()
+        ]
+
+    def _compute_type_dists(
+        self,
+        configs: List[Dict[str, Any]]
+    ) -> Tuple[int, Dict[str, float], Dict[str, float]]:
+        """Compute the total count and difficulty/blooms weights in one pass"""
+        total_for_type = 0
+        difficulty_counts = {}
+        blooms_counts = {}
+
+        for config in configs:
+            count = config['count']
+            total_for_type += count
+            diff = config['difficulty']
+            blooms = config['blooms_level']
+            difficulty_counts[diff] = difficulty_counts.get(diff, 0) + count
+            blooms_counts[blooms] = blooms_counts.get(blooms, 0) + count
+
+        inv_total = 1.0 / total_for_type if total_for_type else 0.0
+        difficulty_dist_for_type = {k: v * inv_total for k, v in difficulty_counts.items()}
+        blooms_dist_for_type = {k: v * inv_total for k, v in blooms_counts.items()}
+
+        return total_for_type, difficulty_dist_for_type, blooms_dist_for_type
+
+    async def _agenerate_single_question_type(
+        self,
+        ctx: GenContext,
         question_type: str,
-        configs: List[Dict[str, Any]],
-        chapter_content: str,
-        chapter_name: str,
-        content_id: str,
-        learning_objectives: Optional[Union[str, List[str]]],
+        total_for_type: int,
         difficulty_distribution: Dict[str, float],
-        blooms_distribution: Dict[str, float],
-        max_chunks: int,
-        max_chars: int
+        blooms_distribution: Dict[str, float]
     ) -> Tuple[str, Optional[str], Optional[Dict[str, Any]], Optional[str]]:
         """
-        Synchronous function for generating a single question type using shared content.
-        This function will be run in parallel using ThreadPoolExecutor.
+        Generate a single question type using shared content.
+        Runs concurrently with the other types via asyncio.as_completed.
         """
         try:
-            total_for_type = sum([config['count'] for config in configs])
-            
-            self.logger.info(f"[THREAD] Generating {question_type} questions (count: {total_for_type})...")
-            
-            # Generate questions based on type
-            if question_type == "mcq":
-                result = self.mcq_generator.generate_mcqs(
-                    chapter_name=chapter_name,
-                    content_id=content_id,
-                    learning_objectives=learning_objectives,
-                    num_questions=total_for_type,
-                    difficulty_distribution=difficulty_distribution,
-                    blooms_taxonomy_distribution=blooms_distribution,
-                    chapter_content=chapter_content,
-                    max_chunks=max_chunks,
-                    max_chars=max_chars
-                )
-            elif question_type == "fib":
-                result = self.fib_generator.generate_fill_in_blank(
-                    chapter_name=chapter_name,
-                    content_id=content_id,
-                    learning_objectives=learning_objectives,
-                    num_questions=total_for_type,
-                    difficulty_distribution=difficulty_distribution,
-                    blooms_taxonomy_distribution=blooms_distribution,
-                    chapter_content=chapter_content,
-                    max_chunks=max_chunks,
-                    max_chars=max_chars
-                )
-            elif question_type == "tf":
-                result = self.tf_generator.generate_true_false(
-                    chapter_name=chapter_name,
-                    content_id=content_id,
-                    learning_objectives=learning_objectives,
-                    num_questions=total_for_type,
-                    difficulty_distribution=difficulty_distribution,
-                    blooms_taxonomy_distribution=blooms_distribution,
-                    chapter_content=chapter_content,
-                    max_chunks=max_chunks,
-                    max_chars=max_chars
-                )
-            else:
+            self.logger.info(f"[TASK] Generating {question_type} questions (count: {total_for_type})...")
+
+            # Generate questions based on type via the dispatch table
+            generator = self._generators.get(question_type)
+            if generator is None:
                 raise ValueError(f"Unknown question type: {question_type}")
-            
+
+            result = await generator(
+                chapter_name=ctx.chapter_name,
+                content_id=ctx.content_id,
+                learning_objectives=ctx.learning_objectives,
+                num_questions=total_for_type,
+                difficulty_distribution=difficulty_distribution,
+                blooms_taxonomy_distribution=blooms_distribution,
+                chapter_content=ctx.chapter_content,
+                max_chunks=ctx.max_chunks,
+                max_chars=ctx.max_chars
+            )
+
             file_name = result.get('metadata', {}).get('filename')
             question_data = result.get('response', [])
-            
-            self.logger.info(f"[THREAD] Completed generating {question_type} questions")
+
+            self.logger.info(f"[TASK] Completed generating {question_type} questions")
             return question_type, file_name, {"response": question_data}, None
-            
+
         except Exception as e:
             import traceback
             error_details = traceback.format_exc()
-            self.logger.error(f"[THREAD] Error generating {question_type} questions: {error_details}")
+            self.logger.error(f"[TASK] Error generating {question_type} questions: {error_details}")
             return question_type, None, None, str(e)
 
 
+async def generate_mcq_and_fib(
+    chapter_name: str,
+    content_id: str,
+    learning_objectives: Optional[Union[str, List[str]]] = None,
+    num_mcq: int = 10,
+    num_fib: int = 10,
+    difficulty_distribution: Dict[str, float] = {"advanced": 1.0},
+    blooms_taxonomy_distribution: Dict[str, float] = {"analyze": 1.0},
+    max_chunks: Optional[int] = None,
+    max_chars: Optional[int] = None
+) -> Dict[str, Dict[str, Any]]:
+    """Generate MCQ and FIB sets for one chapter with overlapping LLM calls.
+
+    Retrieves the chapter content once and fires both generations through
+    asyncio.gather so the two Bedrock calls run concurrently instead of the
+    second waiting on the first's full decode.
+    """
+    content_service = get_content_service()
+    chapter_content = await content_service.retrieve_chapter_content(
+        chapter_name=chapter_name,
+        content_id=content_id,
+        max_chunks=max_chunks,
+        max_chars=max_chars
+    )
+
+    mcq_result, fib_result = await asyncio.gather(
+        get_mcq_generator().agenerate_mcqs(
+            chapter_name=chapter_name,
+            content_id=content_id,
+            learning_objectives=learning_objectives,
+            num_questions=num_mcq,
+            difficulty_distribution=difficulty_distribution,
+            blooms_taxonomy_distribution=blooms_taxonomy_distribution,
+            chapter_content=chapter_content
+        ),
+        get_fib_generator().agenerate_fill_in_blank(
+            chapter_name=chapter_name,
+            content_id=content_id,
+            learning_objectives=learning_objectives,
+            num_questions=num_fib,
+            difficulty_distribution=difficulty_distribution,
+            blooms_taxonomy_distribution=blooms_taxonomy_distribution,
+            chapter_content=chapter_content
+        )
+    )
+
+    return {"mcq": mcq_result, "fib": fib_result}
+
+
+@functools.lru_cache(maxsize=1)
 def get_question_generation_service() -> QuestionGenerationService:
-    """Get question generation service instance"""
+    """Get the shared question generation service instance"""
     return QuestionGenerationService()
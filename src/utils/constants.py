@@ -65,6 +65,15 @@ CRITICAL REQUIREMENTS:
 For each question, tag all applicable learning objectives and ensure the question provides valuable assessment that genuinely measures student understanding.
 """
 
+# Invariant prompt tail, built once at import so prompt builders append a
+# shared string instead of re-copying the multi-KB guidelines per call
+CENGAGE_GUIDELINES_PROMPT_TAIL = f"""
+        Make sure to vary the cognitive demands according to the Bloom's taxonomy levels specified.
+
+        Follow these Cengage guidelines:
+        {CENGAGE_GUIDELINES}
+        """
+
 # Default question distribution
 DEFAULT_QUESTION_TYPE_DISTRIBUTION = {
     QUESTION_TYPE_MCQ: 0.4,
@@ -1,30 +1,162 @@
 """
 Helper functions for question generation
 """
-import json
+import functools
+import itertools
+import os
+import sys
 import uuid
-from typing import Dict, Any, List, Union, Tuple
+
+import numpy as np
+import orjson
+from typing import Dict, Any, Iterable, List, NamedTuple, Union, Tuple
 
 from src.core.logging import LoggerMixin
 
+# Optional: JIT-compile the apportionment kernel when numba is installed;
+# the vectorized numpy path below is the fallback
+try:
+    from numba import njit
+except ImportError:
+    njit = None
 
-class QuestionHelpers(LoggerMixin):
-    """Helper functions for question generation"""
-    
-    @staticmethod
-    def get_difficulty_description(difficulty: str) -> str:
-        """Return a description of what each difficulty level means for question generation"""
-        descriptions = {
-            "basic": "recall of facts and basic understanding of concepts",
-            "intermediate": "application of concepts and analysis of relationships", 
-            "advanced": "synthesis of multiple concepts and evaluation of complex scenarios"
-        }
-        return descriptions.get(difficulty, "appropriate college-level understanding")
-    
-    @staticmethod
-    def get_blooms_description(blooms_level: str) -> str:
-        """Return a description of what each Bloom's taxonomy level means for question generation"""
-        descriptions = {
+
+def _apportion_numpy(
+    total_questions: int,
+    q_ratios: "np.ndarray",
+    d_ratios: "np.ndarray",
+    b_ratios: "np.ndarray"
+) -> "np.ndarray":
+    """Floored counts plus Hamilton remainder as a flat int64 array"""
+    exact = (
+        total_questions
+        * q_ratios[:, None, None]
+        * d_ratios[None, :, None]
+        * b_ratios[None, None, :]
+    ).ravel()
+    counts = np.floor(exact).astype(np.int64)
+
+    # Hand the remainder to the combos with the largest fractional parts.
+    # A selection (O(n)) replaces a full sort; ties at the cutoff go to
+    # the earliest combos, matching the original nested-loop order.
+    # Distributions that sum to less than 1 (the schema does not enforce
+    # it) can leave a remainder larger than the combo count; cap it at
+    # one extra per combo like the original loop did.
+    remainder = min(total_questions - int(counts.sum()), counts.size)
+    if remainder > 0:
+        frac = exact - counts
+        cutoff = np.partition(frac, frac.size - remainder)[frac.size - remainder]
+        above = np.nonzero(frac > cutoff)[0]
+        counts[above] += 1
+        need = remainder - above.size
+        if need > 0:
+            tied = np.nonzero(frac == cutoff)[0][:need]
+            counts[tied] += 1
+
+    return counts
+
+
+def _apportion_loops(
+    total_questions: int,
+    q_ratios: "np.ndarray",
+    d_ratios: "np.ndarray",
+    b_ratios: "np.ndarray"
+) -> "np.ndarray":
+    """Loop form of _apportion_numpy, written for numba's nopython mode.
+
+    The repeated max scan hands out the remainder one slot at a time
+    (incrementing a count makes its fractional part negative), resolving
+    ties by the lowest flat index like the numpy version.
+    """
+    n_q = q_ratios.size
+    n_d = d_ratios.size
+    n_b = b_ratios.size
+    n = n_q * n_d * n_b
+
+    exact = np.empty(n, dtype=np.float64)
+    counts = np.empty(n, dtype=np.int64)
+    assigned = 0
+    index = 0
+    for i in range(n_q):
+        q_part = total_questions * q_ratios[i]
+        for j in range(n_d):
+            qd_part = q_part * d_ratios[j]
+            for k in range(n_b):
+                value = qd_part * b_ratios[k]
+                floored = np.int64(value)
+                exact[index] = value
+                counts[index] = floored
+                assigned += floored
+                index += 1
+
+    # Same cap as _apportion_numpy: at most one extra per combo, so both
+    # kernels agree even when the distributions do not sum to 1
+    remainder = total_questions - assigned
+    if remainder > n:
+        remainder = n
+    for _ in range(remainder):
+        best = 0
+        best_frac = -1.0
+        for m in range(n):
+            frac = exact[m] - counts[m]
+            if frac > best_frac:
+                best_frac = frac
+                best = m
+        counts[best] += 1
+
+    return counts
+
+
+if njit is not None:
+    _apportion = njit(cache=True)(_apportion_loops)
+else:
+    _apportion = _apportion_numpy
+
+
+@functools.lru_cache(maxsize=64)
+def _cached_sequence(frozen_breakdown: Tuple[Tuple[str, str, int], ...]) -> Tuple[Tuple[str, str], ...]:
+    """Expand a frozen breakdown into its (difficulty, blooms_level) sequence.
+
+    chain.from_iterable over itertools.repeat builds one pair tuple per
+    combo and shares it across every repeated slot; interning the level
+    strings collapses duplicates across breakdowns too, so equal pairs
+    compare and hash by pointer downstream.
+    """
+    return tuple(itertools.chain.from_iterable(
+        itertools.repeat((sys.intern(difficulty), sys.intern(blooms_level)), count)
+        for difficulty, blooms_level, count in frozen_breakdown
+    ))
+
+
+# Filename helpers: one C-level pass for chapter-name cleanup and a shared
+# suffix table instead of a per-call dict literal
+_CHAPTER_TRANSLATE = str.maketrans({" ": "_", "/": "_"})
+_FILENAME_SUFFIXES = {
+    "mcq": "mcqs",
+    "fib": "fib",
+    "tf": "tf"
+}
+
+# The description/guideline helpers below are memoized at module level: the
+# level/type cross product is tiny (a handful of distinct outputs), so each
+# string is built once and every later call is a cache hit
+
+
+@functools.lru_cache(maxsize=None)
+def _difficulty_description(difficulty: str) -> str:
+    """Return a description of what each difficulty level means for question generation"""
+    descriptions = {
+        "basic": "recall of facts and basic understanding of concepts",
+        "intermediate": "application of concepts and analysis of relationships",
+        "advanced": "synthesis of multiple concepts and evaluation of complex scenarios"
+    }
+    return descriptions.get(difficulty, "appropriate college-level understanding")
+
+
+@functools.lru_cache(maxsize=None)
+def _blooms_description(blooms_level: str) -> str:
+    """Return a description of what each Bloom's taxonomy level means for question generation"""
+    descriptions = {
             "remember": """Remember/Understand level - Assessment items that ask students to show they can recall basic information or understand basic concepts. Questions should focus on:
         - Recalling definitions, facts, and basic information
         - Understanding fundamental concepts
@@ -56,17 +188,21 @@ class QuestionHelpers(LoggerMixin):
         
         Examples: "Based on the scenario, which strategy would maximize...", "Given the situation, rank the following actions...", "Which combination of factors would be most effective...", "Analyze the data to determine..."
         """
-        }
-        return descriptions.get(blooms_level, "appropriate cognitive level thinking")
-    
-    @staticmethod
-    def get_blooms_question_guidelines(blooms_level: str, question_type: str) -> str:
-        """Return specific guidelines for creating questions at a given Bloom's level and question type"""
-        base_description = QuestionHelpers.get_blooms_description(blooms_level)
-        
-        if question_type == "mcq":
-            if blooms_level == "remember":
-                return f"""{base_description}
+    }
+    return descriptions.get(blooms_level, "appropriate cognitive level thinking")
+
+
+def _build_guideline(blooms_level: str, question_type: str) -> str:
+    """Build the guideline text for one Bloom's level / question type combo.
+
+    Runs once per combo at import to populate _GUIDELINES; the hot path
+    never enters this cascade.
+    """
+    base_description = _blooms_description(blooms_level)
+
+    if question_type == "mcq":
+        if blooms_level == "remember":
+            return f"""{base_description}
 
 For Multiple Choice Questions at Remember level:
 - Focus on direct recall of facts, definitions, and basic concepts
@@ -74,9 +210,9 @@ For Multiple Choice Questions at Remember level:
 - Correct answer should be clearly stated in the content
 - Distractors should be plausible but clearly incorrect facts/terms
 - Avoid scenario-based questions at this level"""
-                
-            elif blooms_level == "apply":
-                return f"""{base_description}
+            
+        elif blooms_level == "apply":
+            return f"""{base_description}
 
 For Multiple Choice Questions at Apply level:
 - Present a scenario or problem that requires applying learned concepts
@@ -84,9 +220,9 @@ For Multiple Choice Questions at Apply level:
 - Correct answer should demonstrate proper application of concepts
 - Distractors should represent common misapplications or errors
 - Include sufficient context for students to apply their knowledge"""
-                
-            elif blooms_level == "analyze":
-                return f"""{base_description}
+            
+        elif blooms_level == "analyze":
+            return f"""{base_description}
 
 For Multiple Choice Questions at Analyze level:
 - Present complex scenarios requiring analysis of multiple variables
@@ -94,10 +230,10 @@ For Multiple Choice Questions at Analyze level:
 - Correct answer should reflect sophisticated analysis or synthesis
 - Distractors should represent superficial or incomplete analysis
 - Questions should require higher-order thinking beyond simple application"""
-        
-        elif question_type == "tf":
-            if blooms_level == "remember":
-                return f"""{base_description}
+    
+    elif question_type == "tf":
+        if blooms_level == "remember":
+            return f"""{base_description}
 
 For True/False Questions at Remember level:
 - State facts, definitions, or basic concepts clearly
@@ -105,9 +241,9 @@ For True/False Questions at Remember level:
 - Statements should test recall of specific details
 - False statements should contradict clearly stated facts
 - Avoid complex relationships or interpretations"""
-                
-            elif blooms_level == "apply":
-                return f"""{base_description}
+            
+        elif blooms_level == "apply":
+            return f"""{base_description}
 
 For True/False Questions at Apply level:
 - Present statements about applying concepts to situations
@@ -115,9 +251,9 @@ For True/False Questions at Apply level:
 - Include statements about cause-and-effect relationships
 - Test understanding of when and how to use specific concepts
 - Statements should require more than simple recall"""
-                
-            elif blooms_level == "analyze":
-                return f"""{base_description}
+            
+        elif blooms_level == "analyze":
+            return f"""{base_description}
 
 For True/False Questions at Analyze level:
 - Present statements requiring analysis of complex relationships
@@ -125,10 +261,10 @@ For True/False Questions at Analyze level:
 - Include statements about effectiveness, appropriateness, or best practices
 - Test ability to analyze scenarios and draw conclusions
 - Statements should require sophisticated reasoning"""
-        
-        elif question_type == "fib":
-            if blooms_level == "remember":
-                return f"""{base_description}
+    
+    elif question_type == "fib":
+        if blooms_level == "remember":
+            return f"""{base_description}
 
 For Fill-in-the-Blank Questions at Remember level:
 - Remove key terms, definitions, or factual information
@@ -136,9 +272,9 @@ For Fill-in-the-Blank Questions at Remember level:
 - Blanks should test recall of specific information
 - Context should clearly point to the expected answer
 - Avoid complex relationships or applications"""
-                
-            elif blooms_level == "apply":
-                return f"""{base_description}
+            
+        elif blooms_level == "apply":
+            return f"""{base_description}
 
 For Fill-in-the-Blank Questions at Apply level:
 - Remove answers that require applying formulas or procedures
@@ -146,9 +282,9 @@ For Fill-in-the-Blank Questions at Apply level:
 - Present scenarios where students must determine outcomes
 - Blanks should test ability to use concepts in context
 - Include sufficient information for students to work through problems"""
-                
-            elif blooms_level == "analyze":
-                return f"""{base_description}
+            
+        elif blooms_level == "analyze":
+            return f"""{base_description}
 
 For Fill-in-the-Blank Questions at Analyze level:
 - Remove conclusions, evaluations, or synthesis results
@@ -156,126 +292,230 @@ For Fill-in-the-Blank Questions at Analyze level:
 - Present complex scenarios requiring analysis
 - Blanks should test higher-order thinking results
 - Require students to analyze information to determine answers"""
-        
-        return base_description
-    
-    @staticmethod
-    def calculate_question_distribution(
-        total_questions: int,
-        question_type_dist: Dict[str, float],
-        difficulty_dist: Dict[str, float],
-        blooms_dist: Dict[str, float]
-    ) -> Dict[str, Dict[str, Any]]:
-        """Calculate the exact number of questions for each combination of question type, difficulty, and bloom's level"""
-        # First, calculate exact fractional counts for all combinations
-        fractional_distribution = {}
-        
-        for q_type, q_ratio in question_type_dist.items():
-            for difficulty, d_ratio in difficulty_dist.items():
-                for blooms, b_ratio in blooms_dist.items():
-                    exact_count = total_questions * q_ratio * d_ratio * b_ratio
-                    key = f"{q_type}_{difficulty}_{blooms}"
-                    fractional_distribution[key] = {
-                        'question_type': q_type,
-                        'difficulty': difficulty,
-                        'blooms_level': blooms,
-                        'exact_count': exact_count,
-                        'count': int(exact_count)  # Floor value
-                    }
-        
-        # Calculate remainder needed to reach total_questions
-        current_total = sum([item['count'] for item in fractional_distribution.values()])
-        remainder = total_questions - current_total
-        
-        # Sort by fractional part (descending) to allocate remainder
-        sorted_keys = sorted(
-            fractional_distribution.keys(),
-            key=lambda k: fractional_distribution[k]['exact_count'] - fractional_distribution[k]['count'],
-            reverse=True
-        )
-        
-        # Distribute remainder to items with highest fractional parts
-        for i in range(remainder):
-            if i < len(sorted_keys):
-                fractional_distribution[sorted_keys[i]]['count'] += 1
-        
-        # Remove items with zero count and clean up the structure
-        distribution = {}
-        for key, item in fractional_distribution.items():
-            if item['count'] > 0:
-                distribution[key] = {
-                    'question_type': item['question_type'],
-                    'difficulty': item['difficulty'],
-                    'blooms_level': item['blooms_level'],
-                    'count': item['count']
-                }
-        
-        return distribution
     
-    @staticmethod
-    def create_question_sequence(question_breakdown: Dict[str, Dict[str, Any]]) -> List[Tuple[str, str]]:
-        """Create a sequence of (difficulty, blooms_level) tuples based on question breakdown"""
-        sequence = []
-        for combo_key, specs in question_breakdown.items():
-            difficulty = specs['difficulty']
-            blooms_level = specs['blooms_level']
-            count = specs['count']
-            
-            # Add this combination 'count' times to the sequence
-            for _ in range(count):
-                sequence.append((difficulty, blooms_level))
-        
-        return sequence
-    
-    @staticmethod
-    def generate_filename(
-        chapter_name: str,
-        difficulty_distribution: Dict[str, float],
-        blooms_distribution: Dict[str, float],
-        question_type: str,
-        learning_objectives: Union[str, List[str], None] = None
-    ) -> str:
-        """Generate a standardized filename for question output"""
-        # Clean chapter name for filename
-        clean_chapter_name = chapter_name.replace(" ", "_").replace("/", "_")
-        
-        # Create distribution strings
-        difficulty_str = "_".join([f"{diff}{int(prop*100)}" for diff, prop in difficulty_distribution.items()])
-        blooms_str = "_".join([f"{bloom}{int(prop*100)}" for bloom, prop in blooms_distribution.items()])
-        
-        filename_parts = [clean_chapter_name, difficulty_str, blooms_str]
-        
-        # Add learning objectives if provided
-        if learning_objectives:
-            obj_str = "lo" + ("_".join([str(obj) for obj in learning_objectives]) if isinstance(learning_objectives, list) else str(learning_objectives))
-            filename_parts.append(obj_str)
-        
-        # Add question type suffix
-        suffix_map = {
-            "mcq": "mcqs",
-            "fib": "fib", 
-            "tf": "tf"
+    return base_description
+
+
+# Full guideline table, materialized once at import: lookup replaces the
+# nine-branch cascade on every call
+_GUIDELINES: Dict[Tuple[str, str], str] = {
+    (blooms_level, question_type): _build_guideline(blooms_level, question_type)
+    for blooms_level in ("remember", "apply", "analyze")
+    for question_type in ("mcq", "tf", "fib")
+}
+
+
+def _blooms_question_guidelines(blooms_level: str, question_type: str) -> str:
+    """Return specific guidelines for creating questions at a given Bloom's level and question type"""
+    guideline = _GUIDELINES.get((blooms_level, question_type))
+    if guideline is None:
+        return _blooms_description(blooms_level)
+    return guideline
+
+
+class Combo(NamedTuple):
+    """One question type / difficulty / Bloom's level slot and its count"""
+    question_type: str
+    difficulty: str
+    blooms_level: str
+    count: int
+
+
+def calculate_question_combos(
+    total_questions: int,
+    question_type_dist: Dict[str, float],
+    difficulty_dist: Dict[str, float],
+    blooms_dist: Dict[str, float]
+) -> List[Combo]:
+    """Apportion questions over every type/difficulty/blooms combination.
+
+    Returns one Combo per non-zero combination, in the same nested order
+    the input dicts imply.
+    """
+    q_types = list(question_type_dist)
+    difficulties = list(difficulty_dist)
+    blooms_levels = list(blooms_dist)
+
+    q_ratios = np.asarray(list(question_type_dist.values()), dtype=np.float64)
+    d_ratios = np.asarray(list(difficulty_dist.values()), dtype=np.float64)
+    b_ratios = np.asarray(list(blooms_dist.values()), dtype=np.float64)
+
+    # Floored counts plus Hamilton remainder, JIT-compiled when numba
+    # is available
+    counts = _apportion(total_questions, q_ratios, d_ratios, b_ratios)
+
+    n_blooms = len(blooms_levels)
+    n_combo = len(difficulties) * n_blooms
+    combos = []
+    for flat_index in np.nonzero(counts)[0]:
+        q_index, rest = divmod(int(flat_index), n_combo)
+        d_index, b_index = divmod(rest, n_blooms)
+        combos.append(Combo(
+            q_types[q_index],
+            difficulties[d_index],
+            blooms_levels[b_index],
+            int(counts[flat_index])
+        ))
+    return combos
+
+
+def calculate_question_distribution(
+    total_questions: int,
+    question_type_dist: Dict[str, float],
+    difficulty_dist: Dict[str, float],
+    blooms_dist: Dict[str, float]
+) -> Dict[str, Dict[str, Any]]:
+    """Calculate the exact number of questions for each combination of question type, difficulty, and bloom's level"""
+    return {
+        f"{combo.question_type}_{combo.difficulty}_{combo.blooms_level}": {
+            'question_type': combo.question_type,
+            'difficulty': combo.difficulty,
+            'blooms_level': combo.blooms_level,
+            'count': combo.count
         }
-        suffix = suffix_map.get(question_type, question_type)
-        
-        return "_".join(filename_parts) + f"_{suffix}.json"
-    
-    @staticmethod
-    def save_questions_to_file(questions: List[Dict[str, Any]], filename: str) -> None:
-        """Save questions to JSON file"""
-        json_response = {"response": questions}
-        with open(filename, 'w', encoding='utf-8') as json_file:
-            json.dump(json_response, json_file, indent=4, ensure_ascii=False)
+        for combo in calculate_question_combos(
+            total_questions, question_type_dist, difficulty_dist, blooms_dist
+        )
+    }
+
+def create_question_sequence(question_breakdown: Dict[str, Dict[str, Any]]) -> Tuple[Tuple[str, str], ...]:
+    """Create a sequence of (difficulty, blooms_level) tuples based on question breakdown.
+
+    The breakdown is deterministic for a given request, so the expansion
+    is memoized on its frozen form and a shared immutable tuple is
+    returned (e.g. MCQ and FIB parsers with the same distribution reuse
+    one sequence).
+    """
+    frozen = tuple(
+        (specs['difficulty'], specs['blooms_level'], specs['count'])
+        for specs in question_breakdown.values()
+    )
+    return _cached_sequence(frozen)
+
+@functools.lru_cache(maxsize=256)
+def _cached_filename(
+    chapter_name: str,
+    diff_items: Tuple[Tuple[str, float], ...],
+    blooms_items: Tuple[Tuple[str, float], ...],
+    question_type: str,
+    learning_objectives: Union[str, Tuple[str, ...], None]
+) -> str:
+    """Build a filename from frozen inputs; memoized on the full tuple"""
+    # Clean chapter name for filename in a single pass
+    clean_chapter_name = chapter_name.translate(_CHAPTER_TRANSLATE)
+
+    # Create distribution strings
+    difficulty_str = "_".join(f"{diff}{int(prop*100)}" for diff, prop in diff_items)
+    blooms_str = "_".join(f"{bloom}{int(prop*100)}" for bloom, prop in blooms_items)
+
+    filename_parts = [clean_chapter_name, difficulty_str, blooms_str]
+
+    # Add learning objectives if provided
+    if learning_objectives:
+        obj_str = "lo" + ("_".join(learning_objectives) if isinstance(learning_objectives, tuple) else str(learning_objectives))
+        filename_parts.append(obj_str)
+
+    # Add question type suffix
+    suffix = _FILENAME_SUFFIXES.get(question_type, question_type)
+
+    return "_".join(filename_parts) + f"_{suffix}.json"
+
+
+def generate_filename(
+    chapter_name: str,
+    difficulty_distribution: Dict[str, float],
+    blooms_distribution: Dict[str, float],
+    question_type: str,
+    learning_objectives: Union[str, List[str], None] = None
+) -> str:
+    """Generate a standardized filename for question output.
+
+    The same inputs recur across the per-type generators of one request,
+    so the assembly is memoized on a frozen form of the arguments.
+    Distribution items keep their insertion order: the filename segments
+    must match what earlier runs produced.
+    """
+    if isinstance(learning_objectives, list):
+        learning_objectives = tuple(str(obj) for obj in learning_objectives)
+    return _cached_filename(
+        chapter_name,
+        tuple(difficulty_distribution.items()),
+        tuple(blooms_distribution.items()),
+        question_type,
+        learning_objectives
+    )
+
+def save_questions_to_file(questions: Union[bytes, Iterable[Dict[str, Any]]], filename: str) -> None:
+    """Save questions to JSON file.
+
+    Accepts either the question dicts or an already-serialized response
+    payload; pre-serialized bytes go to disk in a single write. Dicts
+    are serialized and written one at a time, so the encoded batch never
+    needs to sit in memory as a single buffer.
+
+    The write goes to a temp file that is atomically renamed over the
+    target, so a crash mid-write never leaves a truncated JSON behind
+    and concurrent readers only ever see a complete file.
+    """
+    tmp_filename = f"{filename}.tmp.{os.getpid()}"
+    try:
+        with open(tmp_filename, 'wb') as json_file:
+            if isinstance(questions, (bytes, bytearray)):
+                json_file.write(questions)
+            else:
+                json_file.write(b'{"response":[')
+                first = True
+                for question in questions:
+                    if not first:
+                        json_file.write(b",")
+                    json_file.write(orjson.dumps(question))
+                    first = False
+                json_file.write(b"]}")
+        os.replace(tmp_filename, filename)
+    except BaseException:
+        try:
+            os.unlink(tmp_filename)
+        except OSError:
+            pass
+        raise
+
+
+class QuestionHelpers(LoggerMixin):
+    """Class facade over the module-level helpers, kept for API compatibility.
+
+    The staticmethod bindings point at the plain functions above, so
+    QuestionHelpers.create_question_sequence(...) and the module-level
+    call are the same function object with no wrapper frame.
+    """
+
+    get_difficulty_description = staticmethod(_difficulty_description)
+    get_blooms_description = staticmethod(_blooms_description)
+    get_blooms_question_guidelines = staticmethod(_blooms_question_guidelines)
+    calculate_question_distribution = staticmethod(calculate_question_distribution)
+    create_question_sequence = staticmethod(create_question_sequence)
+    generate_filename = staticmethod(generate_filename)
+    save_questions_to_file = staticmethod(save_questions_to_file)
+
+
+@functools.lru_cache(maxsize=None)
+def format_combo_guidelines(difficulty: str, blooms_level: str, question_type: str, count: int) -> str:
+    """Format the per-combination guideline paragraph embedded in prompts.
+
+    The {difficulty} x {blooms_level} x {question_type} cross product is
+    small and recurs across requests, so formatted paragraphs are cached.
+    """
+    return f"""
+For {count} questions at {difficulty.upper()} difficulty and {blooms_level.upper()} Bloom's level:
+- Difficulty: {_difficulty_description(difficulty)}
+- Bloom's Level Guidelines: {_blooms_question_guidelines(blooms_level, question_type)}
+            """
 
 
-# Create a singleton instance for easy access
+# Singleton instance kept for callers that go through the class facade
 question_helpers = QuestionHelpers()
 
-# Export commonly used functions
-get_difficulty_description = question_helpers.get_difficulty_description
-get_blooms_description = question_helpers.get_blooms_description
-get_blooms_question_guidelines = question_helpers.get_blooms_question_guidelines
-calculate_question_distribution = question_helpers.calculate_question_distribution
-create_question_sequence = question_helpers.create_question_sequence
-generate_filename = question_helpers.generate_filename
-save_questions_to_file = question_helpers.save_questions_to_file
+# Public aliases for the underscore-named description helpers; the other
+# module-level functions above are exported under their own names
+get_difficulty_description = _difficulty_description
+get_blooms_description = _blooms_description
+get_blooms_question_guidelines = _blooms_question_guidelines